@@ -0,0 +1,252 @@
+"""Admission control for requests to the Alertmanager API.
+
+Requests pass through a token bucket (``ALERTMANAGER_RATE_LIMIT`` requests per second
+with a burst of ``ALERTMANAGER_RATE_BURST``) and a cap on concurrent upstream requests
+(``ALERTMANAGER_MAX_CONCURRENCY``). Waiting requests are admitted strictly by priority,
+then by arrival, so silence writes overtake queued reads. A request that cannot be
+admitted within its wait budget raises :class:`AdmissionRejectedError`.
+
+Tool calls wait with :meth:`AdmissionController.admit_async` on the event loop and
+only hand the admitted request to a worker thread. Waiting in a worker thread would
+let queued reads occupy the whole ``asyncio.to_thread`` pool, so that later writes
+queue first-come in the pool and never reach the priority queue.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager, suppress
+from enum import IntEnum
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Admission priority; lower values are admitted first."""
+
+    WRITE = 0
+    READ = 1
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when a request is not admitted within its wait budget."""
+
+
+class _PriorityStats:
+    def __init__(self) -> None:
+        self.admitted = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "avg_wait_seconds": self.total_wait / self.admitted if self.admitted else 0.0,
+            "max_wait_seconds": self.max_wait,
+        }
+
+
+class AdmissionController:
+    """Thread-safe token bucket and concurrency limiter with priority queuing.
+
+    A rate of 0 disables the token bucket and a max_concurrency of 0 disables the
+    concurrency cap. With both disabled, :meth:`admit` does no locking at all.
+    """
+
+    def __init__(self, rate: float, burst: int, max_concurrency: int) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.max_concurrency = max_concurrency
+        self.enabled = rate > 0 or max_concurrency > 0
+
+        self._cond = threading.Condition()
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        self._in_flight = 0
+        self._waiting: list[tuple[int, int]] = []
+        # ticket -> (loop, event) of waiters blocked in admit_async
+        self._async_waiters: dict[
+            tuple[int, int], tuple[asyncio.AbstractEventLoop, asyncio.Event]
+        ] = {}
+        self._sequence = itertools.count()
+        self._max_queue_depth = 0
+        self._stats = {priority: _PriorityStats() for priority in Priority}
+
+    @contextmanager
+    def admit(self, priority: Priority, max_wait: float) -> Iterator[None]:
+        """Hold an admission slot for the duration of the block.
+
+        Args:
+            priority: Priority of the request
+            max_wait: Maximum time in seconds to wait for admission
+
+        Raises:
+            AdmissionRejectedError: If the request is not admitted within max_wait
+        """
+        if not self.enabled:
+            yield
+            return
+        self._acquire(priority, max_wait)
+        try:
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def admit_async(self, priority: Priority, max_wait: float) -> AsyncIterator[None]:
+        """Hold an admission slot for the duration of the block, waiting on the event loop.
+
+        Waiters of :meth:`admit` and :meth:`admit_async` share one queue.
+
+        Raises:
+            AdmissionRejectedError: If the request is not admitted within max_wait
+        """
+        if not self.enabled:
+            yield
+            return
+        await self._acquire_async(priority, max_wait)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _refill(self, now: float) -> None:
+        if self.rate > 0:
+            elapsed = now - self._refilled_at
+            self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate)
+        self._refilled_at = now
+
+    def _can_admit(self, ticket: tuple[int, int]) -> bool:
+        if self._waiting[0] != ticket:
+            return False
+        if self.max_concurrency > 0 and self._in_flight >= self.max_concurrency:
+            return False
+        return not (self.rate > 0 and self._tokens < 1)
+
+    def _enqueue(self, priority: Priority) -> tuple[int, int]:
+        ticket = (int(priority), next(self._sequence))
+        heapq.heappush(self._waiting, ticket)
+        self._max_queue_depth = max(self._max_queue_depth, len(self._waiting))
+        return ticket
+
+    def _poll(
+        self, ticket: tuple[int, int], priority: Priority, started: float, max_wait: float
+    ) -> float | None:
+        """Admit the ticket if possible, returning None, or the time to wait before retrying.
+
+        Must be called with the lock held.
+
+        Raises:
+            AdmissionRejectedError: If the wait budget is spent
+        """
+        now = time.monotonic()
+        self._refill(now)
+        if self._can_admit(ticket):
+            heapq.heappop(self._waiting)
+            self._in_flight += 1
+            if self.rate > 0:
+                self._tokens -= 1
+
+            waited = now - started
+            stats = self._stats[priority]
+            stats.admitted += 1
+            stats.total_wait += waited
+            stats.max_wait = max(stats.max_wait, waited)
+            # Let the next request in line re-check its admission
+            self._notify()
+            return None
+
+        remaining = started + max_wait - now
+        if remaining <= 0:
+            self._dequeue(ticket)
+            self._stats[priority].rejected += 1
+            logger.warning(
+                "Admission rejected: priority=%s, waited=%.3fs, queue_depth=%d",
+                priority.name,
+                now - started,
+                len(self._waiting),
+            )
+            raise AdmissionRejectedError(
+                f"{priority.name} request not admitted within {max_wait}s "
+                f"(queue depth {len(self._waiting)}, in flight {self._in_flight})"
+            )
+        if self.rate > 0 and self._tokens < 1:
+            return min(remaining, (1 - self._tokens) / self.rate)
+        return remaining
+
+    def _dequeue(self, ticket: tuple[int, int]) -> None:
+        self._waiting.remove(ticket)
+        heapq.heapify(self._waiting)
+        # The head of the queue may have changed
+        self._notify()
+
+    def _notify(self) -> None:
+        """Wake the waiters after a state change. Must be called with the lock held."""
+        self._cond.notify_all()
+        # Only the head of the queue can be admitted; the other async waiters
+        # wake up on their own for their deadline
+        if self._waiting and self._waiting[0] in self._async_waiters:
+            loop, event = self._async_waiters[self._waiting[0]]
+            loop.call_soon_threadsafe(event.set)
+
+    def _acquire(self, priority: Priority, max_wait: float) -> None:
+        with self._cond:
+            started = time.monotonic()
+            ticket = self._enqueue(priority)
+            while (timeout := self._poll(ticket, priority, started, max_wait)) is not None:
+                self._cond.wait(timeout)
+
+    async def _acquire_async(self, priority: Priority, max_wait: float) -> None:
+        event = asyncio.Event()
+        with self._cond:
+            started = time.monotonic()
+            ticket = self._enqueue(priority)
+            self._async_waiters[ticket] = (asyncio.get_running_loop(), event)
+        try:
+            while True:
+                with self._cond:
+                    timeout = self._poll(ticket, priority, started, max_wait)
+                    if timeout is None:
+                        return
+                    event.clear()
+                with suppress(TimeoutError):
+                    await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.CancelledError:
+            with self._cond:
+                if ticket in self._waiting:
+                    self._dequeue(ticket)
+            raise
+        finally:
+            with self._cond:
+                del self._async_waiters[ticket]
+
+    def _release(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._notify()
+
+    def stats(self) -> dict[str, Any]:
+        """Return queue depth, in-flight count and per-priority wait statistics."""
+        with self._cond:
+            self._refill(time.monotonic())
+            return {
+                "enabled": self.enabled,
+                "rate_limit": self.rate,
+                "burst": self.burst,
+                "max_concurrency": self.max_concurrency,
+                "queue_depth": len(self._waiting),
+                "max_queue_depth": self._max_queue_depth,
+                "in_flight": self._in_flight,
+                "tokens": self._tokens if self.rate > 0 else None,
+                "priorities": {
+                    priority.name.lower(): stats.as_dict()
+                    for priority, stats in self._stats.items()
+                },
+            }
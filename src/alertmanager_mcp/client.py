@@ -1,14 +1,70 @@
+import asyncio
 import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import UTC, datetime
 from typing import Any, cast
 from urllib.parse import urljoin
 
 import requests
 from requests.auth import HTTPBasicAuth
 
+from .admission import AdmissionController, AdmissionRejectedError, Priority
 from .config import Config
+from .profiling import phase
+from .routing import RoutingTree, config_hash
 
 logger = logging.getLogger(__name__)
 
+# Number of distinct read responses kept as fallback for rejected reads
+READ_CACHE_SIZE = 32
+
+_stale_reads: ContextVar[list[str] | None] = ContextVar(
+    "alertmanager_mcp_stale_reads", default=None
+)
+
+
+@dataclass(frozen=True)
+class _Admission:
+    """Admission decided on the event loop by :meth:`AlertmanagerClient.run`."""
+
+    priority: Priority
+    # Set when a read was not admitted and must be served from the cache
+    rejected: AdmissionRejectedError | None = None
+
+
+_admission: ContextVar[_Admission | None] = ContextVar("alertmanager_mcp_admission", default=None)
+
+
+@contextmanager
+def track_stale_reads() -> Iterator[list[str]]:
+    """Collect the fetch times of cached responses served within the block.
+
+    The list is shared with worker threads started via ``asyncio.to_thread``,
+    which copy the current context. Blocks can be nested; the entries of an inner
+    block are added to the enclosing one as well.
+
+    Example:
+        >>> with track_stale_reads() as cached_at:
+        ...     alerts = client.get_alerts()
+        >>> cached_at
+        ['2025-12-11T10:00:00+00:00']
+    """
+    outer = _stale_reads.get()
+    cached_at: list[str] = []
+    token = _stale_reads.set(cached_at)
+    try:
+        yield cached_at
+    finally:
+        _stale_reads.reset(token)
+        if outer is not None:
+            outer.extend(cached_at)
+
 
 class AlertmanagerClient:
     """
@@ -26,12 +82,137 @@ class AlertmanagerClient:
         else:
             logger.debug("No authentication configured for Alertmanager client")
 
+        self.admission = AdmissionController(
+            rate=config.rate_limit,
+            burst=config.rate_burst,
+            max_concurrency=config.max_concurrency,
+        )
+        # (path, params) -> (fetch time, response data)
+        self._read_cache: OrderedDict[tuple[str, str], tuple[str, Any]] = OrderedDict()
+        self._read_cache_lock = threading.Lock()
+        self.cache_fallbacks = 0
+
+        self._routing_tree: RoutingTree | None = None
+        self._routing_checked_at = 0.0
+        self._routing_lock = threading.Lock()
+
+    async def run[**P, R](
+        self, priority: Priority, fn: Callable[P, R], /, *args: P.args, **kwargs: P.kwargs
+    ) -> R:
+        """
+        Run a blocking client method in a worker thread once it is admitted.
+
+        The admission wait happens on the event loop, so waiting requests do not
+        occupy worker threads and writes overtake any number of queued reads. The
+        requests made by fn are not admitted again. A rejected read still runs fn,
+        whose requests are then served from the read cache.
+
+        Args:
+            priority: Admission priority; use WRITE for writes and the lookups preceding them
+            fn: Client method to run, e.g. ``client.get_alerts``
+
+        Raises:
+            AdmissionRejectedError: If the request is not admitted and no cached
+                response is available
+        """
+        if not self.admission.enabled:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+
+        try:
+            async with self.admission.admit_async(priority, self._max_wait(priority)):
+                # fn does not raise AdmissionRejectedError once admitted
+                return await self._to_thread(_Admission(priority), fn, *args, **kwargs)
+        except AdmissionRejectedError as e:
+            if priority == Priority.WRITE:
+                raise
+            rejected = e
+        return await self._to_thread(_Admission(priority, rejected), fn, *args, **kwargs)
+
+    def _max_wait(self, priority: Priority) -> float:
+        """Writes wait up to the request timeout, reads up to ``config.read_max_wait``."""
+        if priority == Priority.WRITE:
+            return float(self.config.request_timeout)
+        return self.config.read_max_wait
+
+    @staticmethod
+    async def _to_thread[**P, R](
+        admission: _Admission, fn: Callable[P, R], /, *args: P.args, **kwargs: P.kwargs
+    ) -> R:
+        token = _admission.set(admission)
+        try:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+        finally:
+            _admission.reset(token)
+
+    @contextmanager
+    def _admit(self, priority: Priority) -> Iterator[None]:
+        """Wait for admission unless it was already decided by :meth:`run`."""
+        decided = _admission.get()
+        if decided is None:
+            with self.admission.admit(priority, self._max_wait(priority)):
+                yield
+        elif decided.rejected is not None:
+            raise decided.rejected
+        else:
+            yield
+
     def _request(self, method: str, path: str, **kwargs: Any) -> Any:
         """
         Internal method to make HTTP requests to the Alertmanager API.
 
+        Outside :meth:`run`, GET requests are admitted as reads, which wait at most
+        ``config.read_max_wait`` seconds, and other methods as writes, which are
+        queued ahead of reads and wait up to the request timeout. Inside
+        :meth:`run` the priority and admission decided there apply. Rejected reads
+        fall back to the last response for the same path and params, and the fetch
+        time of that response is recorded for :func:`track_stale_reads`. Writes
+        never use the cache.
+
         Returns:
             Response data (can be dict, list, or other JSON types).
+
+        Raises:
+            AdmissionRejectedError: If the request is not admitted and no cached
+                response is available
+        """
+        if not self.admission.enabled:
+            return self._send(method, path, **kwargs)
+
+        decided = _admission.get()
+        if decided is not None:
+            priority = decided.priority
+        else:
+            priority = Priority.READ if method == "GET" else Priority.WRITE
+        if priority == Priority.WRITE:
+            with self._admit(Priority.WRITE):
+                return self._send(method, path, **kwargs)
+
+        cache_key = (path, repr(sorted(kwargs.get("params", {}).items())))
+        try:
+            with self._admit(Priority.READ):
+                data = self._send(method, path, **kwargs)
+        except AdmissionRejectedError:
+            with self._read_cache_lock:
+                if cache_key not in self._read_cache:
+                    raise
+                self.cache_fallbacks += 1
+                cached_at, data = self._read_cache[cache_key]
+            logger.warning("Serving cached response for %s %s from %s", method, path, cached_at)
+            stale_reads = _stale_reads.get()
+            if stale_reads is not None:
+                stale_reads.append(cached_at)
+            return data
+
+        with self._read_cache_lock:
+            self._read_cache[cache_key] = (datetime.now(UTC).isoformat(), data)
+            self._read_cache.move_to_end(cache_key)
+            if len(self._read_cache) > READ_CACHE_SIZE:
+                self._read_cache.popitem(last=False)
+        return data
+
+    def _send(self, method: str, path: str, **kwargs: Any) -> Any:
+        """
+        Send a single HTTP request to the Alertmanager API.
         """
         # Ensure base URL ends with / for urljoin to work correctly
         base_url = self.config.alertmanager_url
@@ -46,17 +227,19 @@ class AlertmanagerClient:
             logger.debug("Request params: %s", kwargs["params"])
 
         try:
-            response = self.session.request(
-                method, url, timeout=self.config.request_timeout, **kwargs
-            )
-            response.raise_for_status()
+            with phase("fetch"):
+                response = self.session.request(
+                    method, url, timeout=self.config.request_timeout, **kwargs
+                )
+                response.raise_for_status()
             logger.debug(
                 "Alertmanager API response: %s %s -> %d",
                 method,
                 path,
                 response.status_code,
             )
-            return response.json()
+            with phase("decode"):
+                return response.json()
         except requests.exceptions.HTTPError as e:
             logger.error(
                 "Alertmanager API error: %s %s -> %s",
@@ -83,6 +266,22 @@ class AlertmanagerClient:
             params["filter"] = filter_query
         return cast(list[dict[str, Any]], self._request("GET", "/api/v2/alerts", params=params))
 
+    def get_all_alerts(self) -> list[dict[str, Any]]:
+        """
+        Fetch every unexpired alert from Alertmanager, whatever its state.
+
+        All state filters (active, silenced, inhibited, unprocessed) are sent as
+        true; ``active=false`` would drop firing alerts from the response.
+
+        Returns:
+            List of alert dictionaries from the Alertmanager API.
+        """
+        params = {"active": "true", "silenced": "true", "inhibited": "true", "unprocessed": "true"}
+        return cast(
+            list[dict[str, Any]],
+            self._request("GET", "/api/v2/alerts", params=params),
+        )
+
     def get_silences(self) -> list[dict[str, Any]]:
         """
         Fetch silences from Alertmanager.
@@ -92,6 +291,39 @@ class AlertmanagerClient:
         """
         return cast(list[dict[str, Any]], self._request("GET", "/api/v2/silences"))
 
+    def get_status(self) -> dict[str, Any]:
+        """
+        Fetch status and configuration from Alertmanager.
+
+        Returns:
+            Status dictionary from the Alertmanager API.
+        """
+        return cast(dict[str, Any], self._request("GET", "/api/v2/status"))
+
+    def get_routing_tree(self) -> RoutingTree:
+        """
+        Return the compiled routing tree of the current Alertmanager configuration.
+
+        The status endpoint is checked at most every ``config.routing_ttl`` seconds,
+        and the tree is only recompiled when the configuration hash changes.
+
+        Raises:
+            ValueError: If the configuration cannot be compiled
+        """
+        with self._routing_lock:
+            now = time.monotonic()
+            tree = self._routing_tree
+            if tree is not None and now - self._routing_checked_at < self.config.routing_ttl:
+                return tree
+
+            original = self.get_status().get("config", {}).get("original", "")
+            if tree is None or tree.config_hash != config_hash(original):
+                logger.info("Compiling Alertmanager routing tree")
+                tree = RoutingTree.from_yaml(original)
+                self._routing_tree = tree
+            self._routing_checked_at = now
+            return tree
+
     def create_silence(
         self,
         matchers: list[dict[str, str]],
@@ -111,3 +343,9 @@ class AlertmanagerClient:
             "createdBy": created_by,
         }
         return cast(dict[str, Any], self._request("POST", "/api/v2/silences", json=payload))
+
+    def get_admission_stats(self) -> dict[str, Any]:
+        """
+        Return admission control statistics for sizing the rate and concurrency limits.
+        """
+        return {**self.admission.stats(), "cache_fallbacks": self.cache_fallbacks}
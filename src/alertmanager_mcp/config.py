@@ -6,6 +6,22 @@ from dotenv import load_dotenv
 logger = logging.getLogger(__name__)
 
 
+def _parse_non_negative(name: str, default: str, type_: type[int] | type[float]) -> float:
+    """Parse a non-negative numeric environment variable."""
+    value_str = os.getenv(name, default)
+    try:
+        value = type_(value_str)
+        if value < 0:
+            raise ValueError(f"{name} must not be negative")
+    except ValueError as e:
+        logger.error("Invalid %s value: %s", name, value_str, exc_info=True)
+        kind = "integer" if type_ is int else "number"
+        raise ValueError(
+            f"Invalid {name} value: must be non-negative {kind}, got {value_str!r}"
+        ) from e
+    return value
+
+
 class Config:
     """
     Configuration class for the Alertmanager MCP server.
@@ -18,6 +34,21 @@ class Config:
         ALERTMANAGER_TIMEOUT (optional): Request timeout in seconds (default: 30)
         ALERTMANAGER_CREATED_BY (optional): Identity for silence creation
             (default: alertmanager-mcp)
+        ALERTMANAGER_PROFILE (optional): Profile every tool call (default: false)
+        ALERTMANAGER_PROFILE_DIR (optional): Directory profiles are written to
+            (default: profiles)
+        ALERTMANAGER_RATE_LIMIT (optional): Upstream requests per second, 0 disables
+            the rate limit (default: 0)
+        ALERTMANAGER_RATE_BURST (optional): Token bucket size for the rate limit
+            (default: 10)
+        ALERTMANAGER_MAX_CONCURRENCY (optional): Maximum concurrent upstream requests,
+            0 disables the cap (default: 0)
+        ALERTMANAGER_READ_MAX_WAIT (optional): Seconds a read waits for admission before
+            falling back to cached data (default: 1)
+        ALERTMANAGER_ROUTING_TTL (optional): Seconds between checks of the Alertmanager
+            configuration used for local routing (default: 60)
+        ALERTMANAGER_SEARCH_TTL (optional): Seconds between refreshes of the search index
+            from the current alerts, 0 refreshes on every search (default: 15)
 
     Note: Authentication is optional. If username and password are not provided,
     requests will be made without authentication.
@@ -49,6 +80,22 @@ class Config:
 
         self.created_by = os.getenv("ALERTMANAGER_CREATED_BY", "alertmanager-mcp")
 
+        profile_str = os.getenv("ALERTMANAGER_PROFILE", "false")
+        if profile_str.lower() not in ("true", "false", "1", "0"):
+            logger.error("Invalid ALERTMANAGER_PROFILE value: %s", profile_str)
+            raise ValueError(
+                f"Invalid ALERTMANAGER_PROFILE value: must be true or false, got {profile_str!r}"
+            )
+        self.profile_enabled = profile_str.lower() in ("true", "1")
+        self.profile_dir = os.getenv("ALERTMANAGER_PROFILE_DIR", "profiles")
+
+        self.rate_limit = _parse_non_negative("ALERTMANAGER_RATE_LIMIT", "0", float)
+        self.rate_burst = int(_parse_non_negative("ALERTMANAGER_RATE_BURST", "10", int))
+        self.max_concurrency = int(_parse_non_negative("ALERTMANAGER_MAX_CONCURRENCY", "0", int))
+        self.read_max_wait = _parse_non_negative("ALERTMANAGER_READ_MAX_WAIT", "1", float)
+        self.routing_ttl = _parse_non_negative("ALERTMANAGER_ROUTING_TTL", "60", float)
+        self.search_ttl = _parse_non_negative("ALERTMANAGER_SEARCH_TTL", "15", float)
+
         if not self.alertmanager_url:
             logger.error("Missing required environment variable: ALERTMANAGER_URL")
             raise ValueError("Missing required environment variable: ALERTMANAGER_URL")
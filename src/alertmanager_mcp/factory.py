@@ -4,12 +4,16 @@ import logging
 
 from .client import AlertmanagerClient
 from .config import get_config
+from .search import AlertIndex
 
 logger = logging.getLogger(__name__)
 
 # Singleton client instance
 _client: AlertmanagerClient | None = None
 
+# Singleton search index instance
+_alert_index: AlertIndex | None = None
+
 
 def get_client() -> AlertmanagerClient:
     """Get or create the Alertmanager client singleton.
@@ -31,3 +35,18 @@ def get_client() -> AlertmanagerClient:
         logger.debug("Initializing Alertmanager client")
         _client = AlertmanagerClient(get_config())
     return _client
+
+
+def get_alert_index() -> AlertIndex:
+    """Get or create the alert search index singleton.
+
+    The index starts empty and is filled incrementally by the search tools.
+
+    Returns:
+        AlertIndex: The singleton alert search index instance.
+    """
+    global _alert_index
+    if _alert_index is None:
+        logger.debug("Initializing alert search index")
+        _alert_index = AlertIndex()
+    return _alert_index
@@ -1,9 +1,19 @@
+import asyncio
+import functools
 import logging
 import re
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from typing import Any, cast
 
-from .client import AlertmanagerClient
+from pydantic import ConfigDict, SkipValidation, ValidationError, validate_call
+
+from .admission import Priority
+from .client import AlertmanagerClient, track_stale_reads
+from .profiling import phase
+from .routing import RoutingTree, parse_matchers
+from .search import AlertIndex
 
 logger = logging.getLogger(__name__)
 
@@ -11,6 +21,25 @@ logger = logging.getLogger(__name__)
 ALERT_SUMMARY_MAX_LENGTH = 200
 
 
+def _reports_stale_reads[**P](
+    fn: Callable[P, Awaitable[dict[str, Any]]],
+) -> Callable[P, Awaitable[dict[str, Any]]]:
+    """Mark a read tool's result as stale when any response came from the read cache.
+
+    Adds 'stale': True and 'cached_at' (fetch time of the oldest cached response).
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> dict[str, Any]:
+        with track_stale_reads() as cached_at:
+            result = await fn(*args, **kwargs)
+        if cached_at:
+            result = {**result, "stale": True, "cached_at": min(cached_at)}
+        return result
+
+    return wrapper
+
+
 def _extract_alert_summary(alert: dict[str, Any]) -> dict[str, Any]:
     """Extract essential fields from an alert for summary view.
 
@@ -38,6 +67,32 @@ def _extract_alert_summary(alert: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+def _find_alert(alerts: list[dict[str, Any]], fingerprint: str) -> dict[str, Any]:
+    """Find an alert by fingerprint.
+
+    Raises:
+        ValueError: If no alert has the given fingerprint; the message previews
+            the available fingerprints
+    """
+    alert = next((a for a in alerts if a.get("fingerprint") == fingerprint), None)
+    if alert:
+        return alert
+
+    logger.warning("Alert not found: %s", fingerprint)
+    available = cast(list[str], [a.get("fingerprint") for a in alerts if a.get("fingerprint")])
+    available_count = len(available)
+    available_preview = ", ".join(available[:3])
+    if available_count > 3:
+        available_preview += f" (and {available_count - 3} more)"
+    raise ValueError(
+        f"Alert with fingerprint '{fingerprint}' not found. "
+        f"Available fingerprints: {available_preview}"
+        if available
+        else f"Alert with fingerprint '{fingerprint}' not found. No alerts available."
+    )
+
+
+@_reports_stale_reads
 async def get_alerts(
     client: AlertmanagerClient, active_only: bool = True, filter: str | None = None
 ) -> dict[str, Any]:
@@ -60,12 +115,16 @@ async def get_alerts(
         'HighMemoryUsage'
     """
     logger.info("Getting alerts: active_only=%s, filter=%s", active_only, filter)
-    alerts = client.get_alerts(active_only=active_only, filter_query=filter)
-    summaries = [_extract_alert_summary(alert) for alert in alerts]
+    alerts = await client.run(
+        Priority.READ, client.get_alerts, active_only=active_only, filter_query=filter
+    )
+    with phase("project"):
+        summaries = [_extract_alert_summary(alert) for alert in alerts]
     logger.info("Retrieved %d alerts", len(summaries))
     return {"alerts": summaries, "count": len(summaries)}
 
 
+@_reports_stale_reads
 async def get_alert_details(client: AlertmanagerClient, fingerprint: str) -> dict[str, Any]:
     """
     MCP tool to get complete details for a specific alert.
@@ -86,22 +145,9 @@ async def get_alert_details(client: AlertmanagerClient, fingerprint: str) -> dic
         'https://example.com/runbook/high-memory'
     """
     logger.info("Getting alert details for fingerprint: %s", fingerprint)
-    alerts = client.get_alerts(active_only=False)
-    alert = next((a for a in alerts if a.get("fingerprint") == fingerprint), None)
-
-    if not alert:
-        logger.warning("Alert not found: %s", fingerprint)
-        available = cast(list[str], [a.get("fingerprint") for a in alerts if a.get("fingerprint")])
-        available_count = len(available)
-        available_preview = ", ".join(available[:3])
-        if available_count > 3:
-            available_preview += f" (and {available_count - 3} more)"
-        raise ValueError(
-            f"Alert with fingerprint '{fingerprint}' not found. "
-            f"Available fingerprints: {available_preview}"
-            if available
-            else f"Alert with fingerprint '{fingerprint}' not found. No alerts available."
-        )
+    alerts = await client.run(Priority.READ, client.get_all_alerts)
+    with phase("project"):
+        alert = _find_alert(alerts, fingerprint)
 
     logger.debug("Found alert: %s", alert.get("labels", {}).get("alertname"))
     return {"alert": alert}
@@ -167,25 +213,10 @@ async def silence_alert(
         comment,
     )
 
-    # Fetch the alert to get its labels
-    alerts = client.get_alerts(active_only=False)
-    alert_to_silence = next(
-        (alert for alert in alerts if alert.get("fingerprint") == fingerprint), None
-    )
-
-    if not alert_to_silence:
-        logger.warning("Alert not found for silencing: %s", fingerprint)
-        available = cast(list[str], [a.get("fingerprint") for a in alerts if a.get("fingerprint")])
-        available_count = len(available)
-        available_preview = ", ".join(available[:3])
-        if available_count > 3:
-            available_preview += f" (and {available_count - 3} more)"
-        raise ValueError(
-            f"Alert with fingerprint '{fingerprint}' not found. "
-            f"Available fingerprints: {available_preview}"
-            if available
-            else f"Alert with fingerprint '{fingerprint}' not found. No alerts available."
-        )
+    # Fetch the alert to get its labels, including firing ones; admitted as a write
+    # so the silence is not queued behind reads or answered from the read cache
+    alerts = await client.run(Priority.WRITE, client.get_all_alerts)
+    alert_to_silence = _find_alert(alerts, fingerprint)
 
     matchers = [
         {"name": name, "value": value, "isRegex": False}
@@ -196,7 +227,9 @@ async def silence_alert(
     ends_at = now + _parse_duration(duration)
 
     logger.debug("Creating silence: matchers=%d, ends_at=%s", len(matchers), ends_at)
-    result = client.create_silence(
+    result = await client.run(
+        Priority.WRITE,
+        client.create_silence,
         matchers=matchers,
         starts_at=now.isoformat(),
         ends_at=ends_at.isoformat(),
@@ -208,6 +241,7 @@ async def silence_alert(
     return {"silence_id": silence_id}
 
 
+@_reports_stale_reads
 async def list_silences(client: AlertmanagerClient) -> dict[str, Any]:
     """
     MCP tool to list silences.
@@ -226,6 +260,409 @@ async def list_silences(client: AlertmanagerClient) -> dict[str, Any]:
         'Maintenance window'
     """
     logger.info("Listing silences")
-    silences = client.get_silences()
+    silences = await client.run(Priority.READ, client.get_silences)
     logger.info("Retrieved %d silences", len(silences))
     return {"silences": silences}
+
+
+@_reports_stale_reads
+async def search_alerts(
+    client: AlertmanagerClient,
+    index: AlertIndex,
+    query: str,
+    limit: int = 20,
+    active_only: bool = True,
+) -> dict[str, Any]:
+    """
+    MCP tool for full-text search over alert annotations and label values.
+
+    The index is refreshed from the current alerts when it is older than
+    ``config.search_ttl``; only new or changed alerts are re-tokenized.
+
+    Args:
+        client: AlertmanagerClient instance
+        index: AlertIndex to refresh and search
+        query: Free text query (e.g., "disk full on node-7")
+        limit: Maximum number of results (default: 20)
+        active_only: Only return active alerts (default: True)
+
+    Returns:
+        Dictionary with ranked alert summaries with 'score' in 'alerts',
+        'count' of returned alerts, 'total' number of matching alerts and
+        'indexed_at' (ISO fetch time of the indexed alerts)
+
+    Example:
+        >>> result = await search_alerts(client, index, query="disk full on node-7")
+        >>> result['alerts'][0]['alertname']
+        'NodeFilesystemAlmostFull'
+    """
+    logger.info("Searching alerts: query=%s, limit=%d, active_only=%s", query, limit, active_only)
+    await _refresh_index(client, index)
+    result = _search_index(index, query, limit=limit, active_only=active_only)
+    indexed_at = index.fetched_at.isoformat() if index.fetched_at else None
+    return {**result, "indexed_at": indexed_at}
+
+
+def _index_is_fresh(index: AlertIndex, ttl: float) -> bool:
+    fetched_at = index.fetched_at
+    return fetched_at is not None and datetime.now(UTC) - fetched_at < timedelta(seconds=ttl)
+
+
+async def _refresh_index(client: AlertmanagerClient, index: AlertIndex) -> None:
+    """Refresh the index from the current alerts if it is older than the search TTL.
+
+    Concurrent searches share one refresh. A snapshot served from the read cache
+    keeps its original fetch time, so it cannot replace newer indexed alerts.
+    """
+    ttl = client.config.search_ttl
+    if _index_is_fresh(index, ttl):
+        return
+    async with index.refresh_lock:
+        if _index_is_fresh(index, ttl):
+            return
+        fetched_at = datetime.now(UTC)
+        with track_stale_reads() as cached_at:
+            alerts = await client.run(Priority.READ, client.get_all_alerts)
+        if cached_at:
+            fetched_at = datetime.fromisoformat(min(cached_at))
+        with phase("index"):
+            changes = await asyncio.to_thread(index.update, alerts, fetched_at)
+        logger.debug("Search index updated: %s", changes)
+
+
+def _search_index(index: AlertIndex, query: str, limit: int, active_only: bool) -> dict[str, Any]:
+    """Search an up-to-date index and project the matches to scored summaries."""
+    with phase("project"):
+        matches, total = index.search(query, limit=limit, active_only=active_only)
+        summaries = [
+            {**_extract_alert_summary(alert), "score": round(score, 4)} for score, alert in matches
+        ]
+    logger.info("Found %d matching alerts, returning %d", total, len(summaries))
+    return {"alerts": summaries, "count": len(summaries), "total": total}
+
+
+async def get_admission_stats(client: AlertmanagerClient) -> dict[str, Any]:
+    """
+    MCP tool to report admission control statistics.
+
+    Args:
+        client: AlertmanagerClient instance
+
+    Returns:
+        Dictionary with queue depth, in-flight requests, per-priority admission
+        counts and wait times, and the number of reads served from cache
+
+    Example:
+        >>> result = await get_admission_stats(client)
+        >>> result['priorities']['read']['max_wait_seconds']
+        0.25
+    """
+    logger.info("Getting admission stats")
+    return client.get_admission_stats()
+
+
+@_reports_stale_reads
+async def route_alert(
+    client: AlertmanagerClient,
+    fingerprint: str | None = None,
+    labels: dict[str, str] | None = None,
+) -> dict[str, Any]:
+    """
+    MCP tool to find the receivers that would be notified for an alert.
+
+    The routing tree is evaluated locally from the cached Alertmanager configuration.
+    When routing by fingerprint, inhibition is checked against the current alerts.
+
+    Args:
+        client: AlertmanagerClient instance
+        fingerprint: Fingerprint of an existing alert to route
+        labels: Label set to route instead of an existing alert
+
+    Returns:
+        Dictionary with 'receivers', matching 'routes' (receiver, route key,
+        continue, group_by, group labels and timings), 'potential_inhibit_rules'
+        that target the alert, 'inhibited' (None when routing labels) and
+        'config_hash' of the evaluated configuration
+
+    Raises:
+        ValueError: If not exactly one of fingerprint and labels is given
+        ValueError: If alert with given fingerprint is not found
+
+    Example:
+        >>> result = await route_alert(client, labels={"severity": "critical", "team": "db"})
+        >>> result['receivers']
+        ['db-pager']
+    """
+    if (fingerprint is None) == (labels is None):
+        raise ValueError("Exactly one of 'fingerprint' and 'labels' must be given")
+    logger.info("Routing alert: fingerprint=%s, labels=%s", fingerprint, labels)
+
+    tree = await client.run(Priority.READ, client.get_routing_tree)
+    alerts = None
+    if fingerprint is not None:
+        alerts = await client.run(Priority.READ, client.get_all_alerts)
+    return _route_one(tree, alerts, fingerprint=fingerprint, labels=labels)
+
+
+def _route_one(
+    tree: RoutingTree,
+    alerts: list[dict[str, Any]] | None,
+    fingerprint: str | None,
+    labels: dict[str, str] | None,
+) -> dict[str, Any]:
+    """Route one alert, looking up its labels by fingerprint if no labels are given.
+
+    When alerts are given, inhibition by these alerts is evaluated as well.
+    """
+    if labels is None:
+        assert alerts is not None and fingerprint is not None
+        labels = cast(dict[str, str], _find_alert(alerts, fingerprint).get("labels", {}))
+
+    result = tree.route(labels, alerts)
+    logger.info("Alert routed to receivers: %s", result["receivers"])
+    return {"labels": labels, **result, "config_hash": tree.config_hash}
+
+
+@_reports_stale_reads
+async def route_alerts(
+    client: AlertmanagerClient,
+    alerts: list[dict[str, str]] | None = None,
+    fingerprints: list[str] | None = None,
+    active_only: bool = True,
+    filter: str | None = None,
+) -> dict[str, Any]:
+    """
+    MCP tool to classify many alerts by receiver in one call.
+
+    Routes the given label sets, or the alerts with the given fingerprints, or
+    otherwise all alerts matching active_only and filter.
+
+    Args:
+        client: AlertmanagerClient instance
+        alerts: Label sets to route
+        fingerprints: Fingerprints of existing alerts to route
+        active_only: When routing existing alerts, only route active ones (default: True)
+        filter: When routing existing alerts, optional Alertmanager filter query string
+
+    Returns:
+        Dictionary with per-alert 'results' (fingerprint, alertname, receivers),
+        alert counts 'by_receiver', 'not_found' fingerprints, 'count' and 'config_hash'
+
+    Example:
+        >>> result = await route_alerts(client, filter='severity="critical"')
+        >>> result['by_receiver']
+        {'db-pager': 12, 'default': 3}
+    """
+    logger.info(
+        "Routing alerts: labels=%d, fingerprints=%d, active_only=%s, filter=%s",
+        len(alerts or []),
+        len(fingerprints or []),
+        active_only,
+        filter,
+    )
+    tree = await client.run(Priority.READ, client.get_routing_tree)
+
+    not_found: list[str] = []
+    if alerts is not None:
+        targets: list[tuple[str | None, dict[str, str]]] = [(None, labels) for labels in alerts]
+    else:
+        if fingerprints is not None:
+            snapshot = await client.run(Priority.READ, client.get_all_alerts)
+            by_fingerprint = {a.get("fingerprint"): a for a in snapshot}
+            not_found = [fp for fp in fingerprints if fp not in by_fingerprint]
+            selected = [by_fingerprint[fp] for fp in fingerprints if fp in by_fingerprint]
+        else:
+            selected = await client.run(
+                Priority.READ, client.get_alerts, active_only=active_only, filter_query=filter
+            )
+        targets = [(a.get("fingerprint"), a.get("labels", {})) for a in selected]
+
+    results = []
+    by_receiver: dict[str, int] = {}
+    for fingerprint, labels in targets:
+        receivers = tree.receivers(labels)
+        for receiver in receivers:
+            by_receiver[receiver] = by_receiver.get(receiver, 0) + 1
+        results.append(
+            {
+                "fingerprint": fingerprint,
+                "alertname": labels.get("alertname"),
+                "receivers": receivers,
+            }
+        )
+
+    logger.info("Routed %d alerts to %d receivers", len(results), len(by_receiver))
+    return {
+        "results": results,
+        "by_receiver": by_receiver,
+        "not_found": not_found,
+        "count": len(results),
+        "config_hash": tree.config_hash,
+    }
+
+
+@dataclass
+class _Snapshot:
+    """Alerts, silences and routing tree shared by the sub-queries of a batch."""
+
+    alerts: list[dict[str, Any]]
+    silences: list[dict[str, Any]]
+    tree: RoutingTree | None
+    index: AlertIndex | None
+
+
+# Validates the arguments of a batch sub-query, which FastMCP passes through
+# unchecked; the snapshot is passed as is
+_validate_args = validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+
+
+@_validate_args
+def _query_get_alerts(
+    snapshot: SkipValidation[_Snapshot], active_only: bool = True, filter: str | None = None
+) -> dict[str, Any]:
+    matchers = parse_matchers(filter) if filter else []
+    with phase("project"):
+        summaries = [
+            _extract_alert_summary(alert)
+            for alert in snapshot.alerts
+            # Same as the active query parameter of the get_alerts tool: with the
+            # other state filters left at true, active=false only drops active alerts
+            if (active_only or alert.get("status", {}).get("state") != "active")
+            and all(m.matches(alert.get("labels", {})) for m in matchers)
+        ]
+    return {"alerts": summaries, "count": len(summaries)}
+
+
+@_validate_args
+def _query_get_alert_details(
+    snapshot: SkipValidation[_Snapshot], fingerprint: str
+) -> dict[str, Any]:
+    return {"alert": _find_alert(snapshot.alerts, fingerprint)}
+
+
+@_validate_args
+def _query_list_silences(snapshot: SkipValidation[_Snapshot]) -> dict[str, Any]:
+    return {"silences": snapshot.silences}
+
+
+@_validate_args
+def _query_search_alerts(
+    snapshot: SkipValidation[_Snapshot], query: str, limit: int = 20, active_only: bool = True
+) -> dict[str, Any]:
+    assert snapshot.index is not None
+    return _search_index(snapshot.index, query, limit=limit, active_only=active_only)
+
+
+@_validate_args
+def _query_route_alert(
+    snapshot: SkipValidation[_Snapshot],
+    fingerprint: str | None = None,
+    labels: dict[str, str] | None = None,
+) -> dict[str, Any]:
+    if (fingerprint is None) == (labels is None):
+        raise ValueError("Exactly one of 'fingerprint' and 'labels' must be given")
+    assert snapshot.tree is not None
+    return _route_one(snapshot.tree, snapshot.alerts, fingerprint=fingerprint, labels=labels)
+
+
+# Read tools available to batch_query, evaluated against a shared snapshot
+BATCH_QUERIES: dict[str, Callable[..., dict[str, Any]]] = {
+    "get_alerts": _query_get_alerts,
+    "get_alert_details": _query_get_alert_details,
+    "list_silences": _query_list_silences,
+    "search_alerts": _query_search_alerts,
+    "route_alert": _query_route_alert,
+}
+
+
+def _validation_message(error: ValidationError) -> str:
+    """Render pydantic validation errors as 'arg: message' pairs."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}"
+        for e in error.errors(include_url=False)
+    )
+
+
+@_reports_stale_reads
+async def batch_query(client: AlertmanagerClient, queries: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    MCP tool to run several read queries against one consistent snapshot.
+
+    Alerts, silences and (if needed) the routing tree are fetched once, in
+    parallel, and every sub-query is evaluated locally against that snapshot.
+    The get_alerts filter is evaluated locally as a list of label matchers.
+    search_alerts queries use an index built from the snapshot for this batch,
+    not the shared index of the search_alerts tool. Sub-query arguments are
+    type-checked, and a failing sub-query reports its error without failing
+    the batch.
+
+    Args:
+        client: AlertmanagerClient instance
+        queries: Sub-queries as {"tool": name, "args": {...}} with tool one of
+            get_alerts, get_alert_details, list_silences, search_alerts, route_alert
+
+    Returns:
+        Dictionary with 'results' in query order, each with 'tool' and either
+        'result' or 'error', and 'snapshot_at' (ISO fetch time of the snapshot;
+        of its oldest part when parts were served from the read cache)
+
+    Example:
+        >>> result = await batch_query(client, queries=[
+        ...     {"tool": "get_alerts", "args": {"filter": 'severity="critical"'}},
+        ...     {"tool": "list_silences"},
+        ... ])
+        >>> [r['tool'] for r in result['results']]
+        ['get_alerts', 'list_silences']
+    """
+    tools = [query.get("tool") for query in queries]
+    logger.info("Running batch query: %s", tools)
+
+    async def _no_silences() -> list[dict[str, Any]]:
+        return []
+
+    async def _no_tree() -> RoutingTree | None:
+        return None
+
+    snapshot_at = datetime.now(UTC).isoformat()
+    with track_stale_reads() as cached_at:
+        alerts, silences, tree = await asyncio.gather(
+            client.run(Priority.READ, client.get_all_alerts),
+            client.run(Priority.READ, client.get_silences)
+            if "list_silences" in tools
+            else _no_silences(),
+            client.run(Priority.READ, client.get_routing_tree)
+            if "route_alert" in tools
+            else _no_tree(),
+        )
+    # Parts served from the read cache were fetched earlier than the others
+    snapshot_at = min([snapshot_at, *cached_at])
+
+    index = None
+    if "search_alerts" in tools:
+        index = AlertIndex()
+        with phase("index"):
+            await asyncio.to_thread(index.update, alerts)
+    snapshot = _Snapshot(alerts=alerts, silences=silences, tree=tree, index=index)
+
+    results: list[dict[str, Any]] = []
+    for query, tool in zip(queries, tools, strict=True):
+        handler = BATCH_QUERIES.get(str(tool))
+        args = query.get("args") or {}
+        try:
+            if handler is None:
+                raise ValueError(
+                    f"Unsupported tool {tool!r}, expected one of: {', '.join(BATCH_QUERIES)}"
+                )
+            if not isinstance(args, dict):
+                raise ValueError(f"Invalid arguments for {tool}: args must be an object")
+            try:
+                result = handler(snapshot, **args)
+            except ValidationError as e:
+                raise ValueError(f"Invalid arguments for {tool}: {_validation_message(e)}") from e
+            results.append({"tool": tool, "result": result})
+        except ValueError as e:
+            logger.warning("Batch sub-query %s failed: %s", tool, e)
+            results.append({"tool": tool, "error": str(e)})
+
+    logger.info("Batch query completed: %d sub-queries", len(results))
+    return {"results": results, "snapshot_at": snapshot_at}
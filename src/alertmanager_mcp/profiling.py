@@ -0,0 +1,211 @@
+"""On-demand profiling of MCP tool calls.
+
+Profiling is opt-in: it is enabled for every call via ``ALERTMANAGER_PROFILE=true``
+or for a single call via the tool's ``profile`` argument. While a call is profiled,
+a background thread samples the stacks of the threads working on it and the code
+under test records phase timings (fetch, decode, project, serialize) through
+:func:`phase`. Each profiled call writes two files to ``ALERTMANAGER_PROFILE_DIR``:
+
+* ``<timestamp>-<tool>.collapsed``: collapsed stacks, one ``frame;frame;frame count``
+  line per unique stack, ready for ``flamegraph.pl`` or speedscope.
+* ``<timestamp>-<tool>.json``: phase timings, total wall time and sample count.
+
+Samples are not tagged per call, so concurrent calls running on the sampled
+threads show up in the collapsed stacks as well; phase timings are per call.
+Phase timings are summed over all threads, so phases that run in parallel, such
+as the fetches of ``batch_query``, can add up to more than the total wall time.
+
+When profiling is disabled, :func:`phase` returns a shared no-op context manager
+and :func:`profiled` calls straight through to the wrapped handler.
+"""
+
+import functools
+import json
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Interval between stack samples in seconds
+SAMPLE_INTERVAL = 0.001
+
+# Deepest stack recorded per sample; deeper frames are truncated at the root side
+MAX_STACK_DEPTH = 128
+
+_NO_PHASE: AbstractContextManager[None] = nullcontext()
+
+
+class Profile:
+    """Profiling state for a single tool call."""
+
+    def __init__(self, tool: str, interval: float = SAMPLE_INTERVAL) -> None:
+        self.tool = tool
+        self.phases: dict[str, float] = {}
+        self.thread_ids: set[int] = {threading.get_ident()}
+        self.total = 0.0
+        self._lock = threading.Lock()
+        self._sampler = _StackSampler(self, interval)
+        self._started_at = 0.0
+
+    def start(self) -> None:
+        self._started_at = time.perf_counter()
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._sampler.stop()
+        self.total = time.perf_counter() - self._started_at
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Accumulate the wall time spent in the block under ``name``.
+
+        Safe to use from several threads at once; overlapping blocks are summed.
+        """
+        with self._lock:
+            self.thread_ids.add(threading.get_ident())
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    @property
+    def stacks(self) -> Counter[str]:
+        return self._sampler.stacks
+
+    def write(self, directory: str) -> Path:
+        """Write collapsed stacks and phase timings, returning the collapsed file path."""
+        out_dir = Path(directory)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"{datetime.now(UTC).strftime('%Y%m%dT%H%M%S.%fZ')}-{self.tool}"
+
+        collapsed_path = out_dir / f"{stem}.collapsed"
+        collapsed_path.write_text(
+            "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+        )
+        summary = {
+            "tool": self.tool,
+            "total_seconds": self.total,
+            "phases": self.phases,
+            "samples": self._sampler.samples,
+            "sample_interval_seconds": self._sampler.interval,
+        }
+        (out_dir / f"{stem}.json").write_text(json.dumps(summary, indent=2))
+        return collapsed_path
+
+
+class _StackSampler(threading.Thread):
+    """Background thread counting collapsed stacks of the profiled threads."""
+
+    def __init__(self, profile: Profile, interval: float) -> None:
+        super().__init__(name="alertmanager-mcp-profiler", daemon=True)
+        self.profile = profile
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            with self.profile._lock:
+                thread_ids = tuple(self.profile.thread_ids)
+            frames = sys._current_frames()
+            for thread_id in thread_ids:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self.stacks[_collapse(frame)] += 1
+                    self.samples += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+def _collapse(frame: FrameType | None) -> str:
+    """Render a frame chain as a root-first, semicolon separated stack."""
+    names: list[str] = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        names.append(f"{code.co_qualname} ({Path(code.co_filename).name}:{frame.f_lineno})")
+        frame = frame.f_back
+    names.reverse()
+    return ";".join(names)
+
+
+_active: ContextVar[Profile | None] = ContextVar("alertmanager_mcp_profile", default=None)
+
+
+def phase(name: str) -> AbstractContextManager[None]:
+    """Time a phase of the current tool call if it is being profiled.
+
+    Example:
+        >>> with phase("fetch"):
+        ...     response = session.request(...)
+    """
+    profile = _active.get()
+    if profile is None:
+        return _NO_PHASE
+    return profile.phase(name)
+
+
+def profiled[**P](
+    tool: str, is_enabled: Callable[[], bool], directory: Callable[[], str]
+) -> Callable[[Callable[P, Awaitable[dict[str, Any]]]], Callable[P, Awaitable[dict[str, Any]]]]:
+    """Decorate an async tool handler with on-demand profiling.
+
+    A call is profiled when ``is_enabled()`` returns True or the call passes
+    ``profile=True``. The serialize phase times ``json.dumps`` of the result as a
+    stand-in for FastMCP's own serialization, which happens outside the handler.
+
+    Args:
+        tool: Tool name used in the output file names
+        is_enabled: Returns whether profiling is enabled for all calls
+        directory: Returns the directory profiles are written to
+    """
+
+    def decorator(
+        fn: Callable[P, Awaitable[dict[str, Any]]],
+    ) -> Callable[P, Awaitable[dict[str, Any]]]:
+        @functools.wraps(fn)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> dict[str, Any]:
+            if not (kwargs.get("profile") or is_enabled()):
+                return await fn(*args, **kwargs)
+
+            profile = Profile(tool)
+            token = _active.set(profile)
+            profile.start()
+            try:
+                result = await fn(*args, **kwargs)
+                with profile.phase("serialize"):
+                    json.dumps(result, default=str)
+                return result
+            finally:
+                profile.stop()
+                _active.reset(token)
+                try:
+                    path = profile.write(directory())
+                    logger.info(
+                        "Profile for %s written to %s (%.1f ms, phases=%s)",
+                        tool,
+                        path,
+                        profile.total * 1000,
+                        {k: round(v * 1000, 3) for k, v in profile.phases.items()},
+                    )
+                except OSError:
+                    logger.error("Failed to write profile for %s", tool, exc_info=True)
+
+        return wrapper
+
+    return decorator
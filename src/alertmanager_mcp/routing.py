@@ -0,0 +1,333 @@
+"""Local evaluation of the Alertmanager routing tree.
+
+The configuration reported by ``/api/v2/status`` is compiled once into a tree of
+:class:`Route` objects with precompiled matchers, so that finding the receivers for
+a label set does not need a round trip to Alertmanager. Evaluation follows
+Alertmanager's dispatcher: a route matches when all its matchers match, children are
+tried in order, the first matching child stops the search unless it has
+``continue: true``, and a matching route without matching children is itself the
+result. Receiver, ``group_by`` and group timings are inherited from the parent.
+
+Inhibit rules are evaluated like Alertmanager's inhibitor when the current alerts
+are known: an alert is inhibited when a rule targets it and another firing alert
+matches the rule's source matchers with the same values for the ``equal`` labels.
+Without the current alerts only the rules that target the label set are known.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from typing import Any, cast
+
+import yaml
+
+# Label name placeholder in group_by meaning "group by all labels"
+GROUP_BY_ALL = "..."
+
+_MATCHER_RE = re.compile(
+    r'^\s*([a-zA-Z_:][a-zA-Z0-9_:]*|"(?:[^"\\]|\\.)*")\s*(=~|!~|!=|=)\s*(.*?)\s*$'
+)
+_ESCAPES = {"\\": "\\", '"': '"', "n": "\n"}
+
+
+def _unquote(text: str) -> str:
+    if len(text) < 2 or text[0] != '"' or text[-1] != '"':
+        return text
+    out: list[str] = []
+    chars = iter(text[1:-1])
+    for char in chars:
+        if char == "\\":
+            escaped = next(chars, "\\")
+            out.append(_ESCAPES.get(escaped, "\\" + escaped))
+        else:
+            out.append(char)
+    return "".join(out)
+
+
+@dataclass(frozen=True)
+class Matcher:
+    """A single label matcher with its regular expression compiled up front."""
+
+    name: str
+    op: str
+    value: str
+    pattern: re.Pattern[str] | None = field(default=None, compare=False, repr=False)
+
+    @classmethod
+    def create(cls, name: str, op: str, value: str) -> Matcher:
+        if op not in ("=", "!=", "=~", "!~"):
+            raise ValueError(f"Invalid matcher operator: {op!r}")
+        pattern = None
+        if op in ("=~", "!~"):
+            try:
+                # Alertmanager regex matchers are anchored at both ends; matches()
+                # uses fullmatch, since "$" would also accept a trailing newline
+                pattern = re.compile(value)
+            except re.error as e:
+                raise ValueError(f"Invalid regex in matcher {name}{op}{value!r}: {e}") from e
+        return cls(name, op, value, pattern)
+
+    def matches(self, labels: dict[str, str]) -> bool:
+        """Return whether the label set matches; missing labels match as empty string."""
+        value = labels.get(self.name, "")
+        if self.op == "=":
+            return value == self.value
+        if self.op == "!=":
+            return value != self.value
+        assert self.pattern is not None
+        matched = self.pattern.fullmatch(value) is not None
+        return matched if self.op == "=~" else not matched
+
+    def __str__(self) -> str:
+        escaped = self.value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        return f'{self.name}{self.op}"{escaped}"'
+
+
+def parse_matcher(text: str) -> Matcher:
+    """Parse a matcher such as ``severity=~"critical|warning"``.
+
+    Raises:
+        ValueError: If the text is not a valid matcher
+    """
+    match = _MATCHER_RE.match(text)
+    if not match:
+        raise ValueError(f"Invalid matcher: {text!r}")
+    name, op, value = match.groups()
+    return Matcher.create(_unquote(name), op, _unquote(value))
+
+
+def parse_matchers(text: str) -> list[Matcher]:
+    """Parse a comma separated matcher list, optionally wrapped in braces.
+
+    Example:
+        >>> [str(m) for m in parse_matchers('{team="db", severity=~"crit.*"}')]
+        ['team="db"', 'severity=~"crit.*"']
+    """
+    text = text.strip()
+    if text.startswith("{") and text.endswith("}"):
+        text = text[1:-1]
+    parts: list[str] = []
+    current: list[str] = []
+    in_quotes = escaped = False
+    for char in text:
+        if escaped:
+            escaped = False
+        elif char == "\\" and in_quotes:
+            escaped = True
+        elif char == '"':
+            in_quotes = not in_quotes
+        elif char == "," and not in_quotes:
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+    parts.append("".join(current))
+    return [parse_matcher(part) for part in parts if part.strip()]
+
+
+def _compile_matchers(
+    config: dict[str, Any], matchers_key: str, match_key: str, match_re_key: str
+) -> tuple[Matcher, ...]:
+    """Compile the new-style matcher list and the legacy match/match_re maps of a config node."""
+    matchers: list[Matcher] = []
+    for name, value in sorted((config.get(match_key) or {}).items()):
+        matchers.append(Matcher.create(name, "=", str(value)))
+    for name, value in sorted((config.get(match_re_key) or {}).items()):
+        matchers.append(Matcher.create(name, "=~", str(value)))
+    for text in config.get(matchers_key) or []:
+        matchers.extend(parse_matchers(text))
+    return tuple(matchers)
+
+
+@dataclass
+class Route:
+    """A node of the compiled routing tree with inherited settings resolved."""
+
+    receiver: str | None
+    group_by: tuple[str, ...]
+    continue_: bool
+    matchers: tuple[Matcher, ...]
+    key: str
+    group_wait: str | None = None
+    group_interval: str | None = None
+    repeat_interval: str | None = None
+    routes: list[Route] = field(default_factory=list)
+
+    @classmethod
+    def compile(cls, config: dict[str, Any], parent: Route | None = None) -> Route:
+        matchers = _compile_matchers(config, "matchers", "match", "match_re")
+        matchers_str = "{" + ",".join(str(m) for m in matchers) + "}"
+        # An empty group_by inherits the parent's, as in Alertmanager
+        group_by = config.get("group_by")
+        if not group_by:
+            group_by = parent.group_by if parent else ()
+        route = cls(
+            receiver=config.get("receiver") or (parent.receiver if parent else None),
+            group_by=tuple(group_by),
+            continue_=bool(config.get("continue", False)),
+            matchers=matchers,
+            key=f"{parent.key}/{matchers_str}" if parent else matchers_str,
+            group_wait=config.get("group_wait") or (parent.group_wait if parent else None),
+            group_interval=config.get("group_interval")
+            or (parent.group_interval if parent else None),
+            repeat_interval=config.get("repeat_interval")
+            or (parent.repeat_interval if parent else None),
+        )
+        route.routes = [cls.compile(child, route) for child in config.get("routes") or []]
+        return route
+
+    def match(self, labels: dict[str, str]) -> list[Route]:
+        """Return the routes that handle the label set, in dispatch order."""
+        for matcher in self.matchers:
+            if not matcher.matches(labels):
+                return []
+        matched: list[Route] = []
+        for child in self.routes:
+            child_matches = child.match(labels)
+            matched.extend(child_matches)
+            if child_matches and not child.continue_:
+                break
+        return matched or [self]
+
+    def group_labels(self, labels: dict[str, str]) -> dict[str, str]:
+        """Return the labels that form the alert's group key on this route."""
+        if GROUP_BY_ALL in self.group_by:
+            return dict(labels)
+        return {name: labels[name] for name in self.group_by if name in labels}
+
+    def describe(self, labels: dict[str, str]) -> dict[str, Any]:
+        return {
+            "receiver": self.receiver,
+            "route": self.key,
+            "continue": self.continue_,
+            "group_by": list(self.group_by),
+            "group_labels": self.group_labels(labels),
+            "group_wait": self.group_wait,
+            "group_interval": self.group_interval,
+            "repeat_interval": self.repeat_interval,
+        }
+
+
+@dataclass(frozen=True)
+class InhibitRule:
+    """A compiled inhibit rule."""
+
+    source_matchers: tuple[Matcher, ...]
+    target_matchers: tuple[Matcher, ...]
+    equal: tuple[str, ...]
+
+    @classmethod
+    def compile(cls, config: dict[str, Any]) -> InhibitRule:
+        return cls(
+            source_matchers=_compile_matchers(
+                config, "source_matchers", "source_match", "source_match_re"
+            ),
+            target_matchers=_compile_matchers(
+                config, "target_matchers", "target_match", "target_match_re"
+            ),
+            equal=tuple(config.get("equal") or ()),
+        )
+
+    def targets(self, labels: dict[str, str]) -> bool:
+        """Return whether an alert with these labels can be inhibited by this rule."""
+        return all(matcher.matches(labels) for matcher in self.target_matchers)
+
+    def sources(self, labels: dict[str, str], alerts: list[dict[str, Any]]) -> list[str]:
+        """Return the fingerprints of the alerts inhibiting the label set under this rule.
+
+        As in Alertmanager, when the label set also matches the source matchers,
+        alerts matching the target matchers are not sources, so that an alert does
+        not inhibit itself.
+
+        Args:
+            labels: Labels of the alert that may be inhibited
+            alerts: Current (unresolved) alerts from the Alertmanager API
+        """
+        if not self.targets(labels):
+            return []
+        exclude_targets = all(matcher.matches(labels) for matcher in self.source_matchers)
+        fingerprints = []
+        for alert in alerts:
+            source = alert.get("labels", {})
+            if not all(matcher.matches(source) for matcher in self.source_matchers):
+                continue
+            if exclude_targets and self.targets(source):
+                continue
+            if all(source.get(name, "") == labels.get(name, "") for name in self.equal):
+                fingerprints.append(str(alert.get("fingerprint")))
+        return fingerprints
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "source_matchers": [str(m) for m in self.source_matchers],
+            "target_matchers": [str(m) for m in self.target_matchers],
+            "equal": list(self.equal),
+        }
+
+
+class RoutingTree:
+    """Compiled routing tree and inhibit rules of one Alertmanager configuration."""
+
+    def __init__(self, root: Route, inhibit_rules: list[InhibitRule], config_hash: str) -> None:
+        self.root = root
+        self.inhibit_rules = inhibit_rules
+        self.config_hash = config_hash
+
+    @classmethod
+    def from_yaml(cls, original: str) -> RoutingTree:
+        """Compile the YAML configuration reported in ``config.original`` of the status API.
+
+        Raises:
+            ValueError: If the configuration is not valid YAML, has no route or contains
+            invalid matchers
+        """
+        try:
+            config = cast(dict[str, Any], yaml.safe_load(original) or {})
+        except yaml.YAMLError as e:
+            raise ValueError(f"Invalid Alertmanager configuration: {e}") from e
+        if not isinstance(config, dict) or not config.get("route"):
+            raise ValueError("Alertmanager configuration has no route")
+        root = Route.compile(config["route"])
+        inhibit_rules = [InhibitRule.compile(rule) for rule in config.get("inhibit_rules") or []]
+        return cls(root, inhibit_rules, config_hash(original))
+
+    def receivers(self, labels: dict[str, str]) -> list[str]:
+        """Return the receivers notified for the label set, without duplicates."""
+        return list(dict.fromkeys(r.receiver for r in self.root.match(labels) if r.receiver))
+
+    def route(
+        self, labels: dict[str, str], alerts: list[dict[str, Any]] | None = None
+    ) -> dict[str, Any]:
+        """Return the matching routes and the inhibit rules that target the label set.
+
+        Args:
+            labels: Label set to route
+            alerts: Current alerts; when given, each rule lists its inhibiting
+                'source_alerts' and 'inhibited' tells whether any rule applies,
+                otherwise 'inhibited' is None
+        """
+        routes = self.root.match(labels)
+        rules = []
+        inhibited = None if alerts is None else False
+        for rule in self.inhibit_rules:
+            if not rule.targets(labels):
+                continue
+            description = rule.describe()
+            if alerts is not None:
+                sources = rule.sources(labels, alerts)
+                description["source_alerts"] = sources
+                inhibited = inhibited or bool(sources)
+            rules.append(description)
+        return {
+            "receivers": list(dict.fromkeys(r.receiver for r in routes if r.receiver)),
+            "routes": [route.describe(labels) for route in routes],
+            "potential_inhibit_rules": rules,
+            "inhibited": inhibited,
+        }
+
+
+def config_hash(original: str) -> str:
+    """Return the hash identifying a configuration text."""
+    return hashlib.sha256(original.encode()).hexdigest()
@@ -0,0 +1,241 @@
+"""Inverted token index for full-text search over alerts.
+
+Every alert is indexed by the lower-cased alphanumeric tokens of its label values
+and annotations. The index is refreshed from an alert snapshot with
+:meth:`AlertIndex.update`, which only re-tokenizes alerts whose indexed text
+changed and drops alerts that are no longer in the snapshot. Snapshots fetched
+before the indexed one, such as responses from the read cache, are ignored. ``updatedAt`` is not
+used for change detection: Alertmanager bumps it every time Prometheus re-sends
+an alert, even if nothing changed.
+
+Results are ranked first by how many distinct query tokens an alert contains and
+then by a tf-idf score, ``sum(idf * (1 + log(tf)))`` over the matched tokens.
+Alerts that contain the same query tokens with the same counts share a score, so a
+search partitions candidates with set operations instead of scoring each alert;
+ties are returned in arbitrary order.
+"""
+
+import asyncio
+import hashlib
+import math
+import re
+import threading
+from collections import Counter
+from datetime import UTC, datetime
+from heapq import nlargest
+from itertools import combinations, islice
+from typing import Any
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Query words too common in alert text to help ranking
+STOPWORDS = frozenset({"a", "an", "and", "at", "for", "in", "is", "of", "on", "the", "to"})
+
+# Most selective query tokens used for ranking; coverage tiers grow as 2^n
+MAX_QUERY_TERMS = 8
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lower-cased alphanumeric tokens, e.g. "node-7" -> ["node", "7"]."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _alert_text(alert: dict[str, Any]) -> str:
+    values = [*alert.get("labels", {}).values(), *alert.get("annotations", {}).values()]
+    return " ".join(str(value) for value in values)
+
+
+class _Document:
+    __slots__ = ("alert", "signature", "terms")
+
+    def __init__(self, alert: dict[str, Any], signature: bytes, terms: Counter[str]) -> None:
+        self.alert = alert
+        self.signature = signature
+        self.terms = terms
+
+
+class AlertIndex:
+    """Thread-safe inverted index from tokens to alert fingerprints."""
+
+    def __init__(self) -> None:
+        self._documents: dict[str, _Document] = {}
+        # token -> fingerprints containing it
+        self._postings: dict[str, set[str]] = {}
+        # token -> tf -> fingerprints, only for tokens occurring more than once
+        self._repeated: dict[str, dict[int, set[str]]] = {}
+        self._active: set[str] = set()
+        self._lock = threading.Lock()
+        # Fetch time of the indexed snapshot
+        self.fetched_at: datetime | None = None
+        # Held by the tools while refreshing, so concurrent searches fetch alerts once
+        self.refresh_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def update(
+        self, alerts: list[dict[str, Any]], fetched_at: datetime | None = None
+    ) -> dict[str, int]:
+        """Synchronize the index with a full alert snapshot.
+
+        Args:
+            alerts: All alerts currently known to Alertmanager
+            fetched_at: When the snapshot was fetched (default: now); a snapshot
+                fetched before the indexed one is ignored
+
+        Returns:
+            Dictionary with the number of 'indexed' (new or changed) and 'removed' alerts
+        """
+        if fetched_at is None:
+            fetched_at = datetime.now(UTC)
+        if self.fetched_at is not None and fetched_at < self.fetched_at:
+            return {"indexed": 0, "removed": 0}
+
+        # Hash outside the lock so searches are not blocked while the snapshot is read
+        entries = []
+        for alert in alerts:
+            fingerprint = alert.get("fingerprint")
+            if fingerprint:
+                text = _alert_text(alert)
+                signature = hashlib.blake2b(text.encode(), digest_size=16).digest()
+                entries.append((fingerprint, alert, text, signature))
+
+        indexed = 0
+        with self._lock:
+            if self.fetched_at is not None and fetched_at < self.fetched_at:
+                return {"indexed": 0, "removed": 0}
+            self.fetched_at = fetched_at
+            seen: set[str] = set()
+            for fingerprint, alert, text, signature in entries:
+                seen.add(fingerprint)
+                # The state changes without changing the indexed text
+                if alert.get("status", {}).get("state") == "active":
+                    self._active.add(fingerprint)
+                else:
+                    self._active.discard(fingerprint)
+
+                document = self._documents.get(fingerprint)
+                if document is not None and document.signature == signature:
+                    document.alert = alert
+                    continue
+
+                if document is not None:
+                    self._remove(fingerprint, document)
+                terms = Counter(tokenize(text))
+                self._documents[fingerprint] = _Document(alert, signature, terms)
+                for term, count in terms.items():
+                    self._postings.setdefault(term, set()).add(fingerprint)
+                    if count > 1:
+                        self._repeated.setdefault(term, {}).setdefault(count, set()).add(
+                            fingerprint
+                        )
+                indexed += 1
+
+            removed = [fp for fp in self._documents if fp not in seen]
+            for fingerprint in removed:
+                self._remove(fingerprint, self._documents[fingerprint])
+                self._active.discard(fingerprint)
+        return {"indexed": indexed, "removed": len(removed)}
+
+    def _remove(self, fingerprint: str, document: _Document) -> None:
+        for term, count in document.terms.items():
+            postings = self._postings[term]
+            postings.discard(fingerprint)
+            if not postings:
+                del self._postings[term]
+            if count > 1:
+                repeated = self._repeated[term]
+                repeated[count].discard(fingerprint)
+                if not repeated[count]:
+                    del repeated[count]
+                if not repeated:
+                    del self._repeated[term]
+        del self._documents[fingerprint]
+
+    def search(
+        self, query: str, limit: int = 20, active_only: bool = False
+    ) -> tuple[list[tuple[float, dict[str, Any]]], int]:
+        """Find alerts containing any of the query tokens.
+
+        Args:
+            query: Free text query
+            limit: Maximum number of results
+            active_only: Only return alerts whose state is active
+
+        Returns:
+            Tuple of the top (score, alert) pairs, best first, and the total number
+            of matching alerts
+        """
+        with self._lock:
+            terms = sorted(
+                {t for t in tokenize(query) if t not in STOPWORDS and t in self._postings},
+                key=lambda t: len(self._postings[t]),
+            )[:MAX_QUERY_TERMS]
+            if not terms:
+                return [], 0
+
+            postings = [self._postings[t] for t in terms]
+            idf = [math.log(1 + len(self._documents) / len(p)) for p in postings]
+            matching = postings[0].union(*postings[1:])
+            if active_only:
+                matching &= self._active
+
+            results: list[tuple[float, str]] = []
+            covered: set[str] = set()
+            # Alerts containing more distinct query tokens rank first
+            for size in range(len(terms), 0, -1):
+                if len(results) >= limit or len(covered) == len(matching):
+                    break
+                need = limit - len(results)
+                candidates: list[tuple[float, str]] = []
+                tier: list[set[str]] = []
+                for combo in combinations(range(len(terms)), size):
+                    # Terms are sorted by selectivity, so the smallest set comes first
+                    group = matching.intersection(*(postings[i] for i in combo))
+                    if covered:
+                        group -= covered
+                    if not group:
+                        continue
+                    tier.append(group)
+                    candidates.extend(self._score_group(group, combo, terms, idf, need))
+                results.extend(nlargest(need, candidates))
+                if len(results) < limit:
+                    covered.update(*tier)
+
+            documents = self._documents
+            return [(score, documents[fp].alert) for score, fp in results], len(matching)
+
+    def _score_group(
+        self,
+        group: set[str],
+        combo: tuple[int, ...],
+        terms: list[str],
+        idf: list[float],
+        need: int,
+    ) -> list[tuple[float, str]]:
+        """Score the best alerts of a group that contains exactly the tokens in combo."""
+        # Split the group into parts whose alerts have the same token counts
+        parts = [(sum(idf[i] for i in combo), group)]
+        for i in combo:
+            buckets = self._repeated.get(terms[i])
+            if not buckets:
+                continue
+            refined: list[tuple[float, set[str]]] = []
+            for score, part in parts:
+                split: list[set[str]] = []
+                for count, fingerprints in buckets.items():
+                    sub = part & fingerprints
+                    if sub:
+                        refined.append((score + idf[i] * math.log(count), sub))
+                        split.append(sub)
+                rest = part.difference(*split)
+                if rest:
+                    refined.append((score, rest))
+            parts = refined
+
+        scored: list[tuple[float, str]] = []
+        for score, part in sorted(parts, key=lambda p: p[0], reverse=True):
+            scored.extend((score, fp) for fp in islice(part, need - len(scored)))
+            if len(scored) >= need:
+                break
+        return scored
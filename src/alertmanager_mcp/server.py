@@ -3,19 +3,32 @@ from typing import Any
 from fastmcp import FastMCP
 
 from . import mcp_tools
-from .factory import get_client
+from .factory import get_alert_index, get_client
+from .profiling import profiled
 
 # Initialize MCP server
 mcp = FastMCP("Alertmanager MCP")
 
 
+def _profile_enabled() -> bool:
+    return get_client().config.profile_enabled
+
+
+def _profile_dir() -> str:
+    return get_client().config.profile_dir
+
+
 @mcp.tool(description="Get alerts from Alertmanager (summary view)")
-async def get_alerts(active_only: bool = True, filter: str | None = None) -> dict[str, Any]:
+@profiled("get_alerts", _profile_enabled, _profile_dir)
+async def get_alerts(
+    active_only: bool = True, filter: str | None = None, profile: bool = False
+) -> dict[str, Any]:
     """Fetch alerts from Alertmanager with essential fields only.
 
     Args:
         active_only: Fetch only active alerts (default: True)
         filter: Optional Alertmanager filter query string
+        profile: Write a profile of this call to the profile directory (default: False)
 
     Returns:
         Dictionary containing list of alert summaries
@@ -24,11 +37,13 @@ async def get_alerts(active_only: bool = True, filter: str | None = None) -> dic
 
 
 @mcp.tool(description="Get detailed information for a specific alert")
-async def get_alert_details(fingerprint: str) -> dict[str, Any]:
+@profiled("get_alert_details", _profile_enabled, _profile_dir)
+async def get_alert_details(fingerprint: str, profile: bool = False) -> dict[str, Any]:
     """Fetch complete details for a specific alert by fingerprint.
 
     Args:
         fingerprint: The fingerprint of the alert to retrieve
+        profile: Write a profile of this call to the profile directory (default: False)
 
     Returns:
         Dictionary containing complete alert details
@@ -37,13 +52,17 @@ async def get_alert_details(fingerprint: str) -> dict[str, Any]:
 
 
 @mcp.tool(description="Silence an alert in Alertmanager")
-async def silence_alert(fingerprint: str, duration: str, comment: str) -> dict[str, Any]:
+@profiled("silence_alert", _profile_enabled, _profile_dir)
+async def silence_alert(
+    fingerprint: str, duration: str, comment: str, profile: bool = False
+) -> dict[str, Any]:
     """Create a silence for an alert.
 
     Args:
         fingerprint: The fingerprint of the alert to silence
         duration: Duration of the silence (e.g., "2h", "1d", "1w")
         comment: A comment explaining the reason for the silence
+        profile: Write a profile of this call to the profile directory (default: False)
 
     Returns:
         Dictionary containing silence_id
@@ -54,14 +73,119 @@ async def silence_alert(fingerprint: str, duration: str, comment: str) -> dict[s
 
 
 @mcp.tool(description="List silences from Alertmanager")
-async def list_silences() -> dict[str, Any]:
+@profiled("list_silences", _profile_enabled, _profile_dir)
+async def list_silences(profile: bool = False) -> dict[str, Any]:
     """List existing silences from Alertmanager.
 
+    Args:
+        profile: Write a profile of this call to the profile directory (default: False)
+
     Returns:
         Dictionary containing list of silences
     """
     return await mcp_tools.list_silences(get_client())
 
 
+@mcp.tool(description="Full-text search over alert annotations and label values")
+@profiled("search_alerts", _profile_enabled, _profile_dir)
+async def search_alerts(
+    query: str, limit: int = 20, active_only: bool = True, profile: bool = False
+) -> dict[str, Any]:
+    """Search alerts by free text, ranked by relevance.
+
+    Args:
+        query: Free text query (e.g., "disk full on node-7")
+        limit: Maximum number of results (default: 20)
+        active_only: Only return active alerts (default: True)
+        profile: Write a profile of this call to the profile directory (default: False)
+
+    Returns:
+        Dictionary containing ranked alert summaries
+    """
+    return await mcp_tools.search_alerts(
+        get_client(), get_alert_index(), query=query, limit=limit, active_only=active_only
+    )
+
+
+@mcp.tool(description="Run several read queries against one consistent alert and silence snapshot")
+@profiled("batch_query", _profile_enabled, _profile_dir)
+async def batch_query(queries: list[dict[str, Any]], profile: bool = False) -> dict[str, Any]:
+    """Evaluate many read queries against a single snapshot fetched once.
+
+    Args:
+        queries: Sub-queries as {"tool": name, "args": {...}}; tool is one of
+            get_alerts, get_alert_details, list_silences, search_alerts, route_alert
+        profile: Write a profile of this call to the profile directory (default: False)
+
+    Returns:
+        Dictionary containing per-query results and the snapshot timestamp
+    """
+    return await mcp_tools.batch_query(get_client(), queries=queries)
+
+
+@mcp.tool(description="Get upstream rate limit and concurrency statistics")
+@profiled("get_admission_stats", _profile_enabled, _profile_dir)
+async def get_admission_stats(profile: bool = False) -> dict[str, Any]:
+    """Report queue depth and wait times of requests to Alertmanager.
+
+    Args:
+        profile: Write a profile of this call to the profile directory (default: False)
+
+    Returns:
+        Dictionary containing admission control statistics
+    """
+    return await mcp_tools.get_admission_stats(get_client())
+
+
+@mcp.tool(description="Find the receivers Alertmanager would notify for an alert")
+@profiled("route_alert", _profile_enabled, _profile_dir)
+async def route_alert(
+    fingerprint: str | None = None,
+    labels: dict[str, str] | None = None,
+    profile: bool = False,
+) -> dict[str, Any]:
+    """Evaluate the Alertmanager routing tree locally for one alert.
+
+    Args:
+        fingerprint: Fingerprint of an existing alert to route
+        labels: Label set to route instead of an existing alert
+        profile: Write a profile of this call to the profile directory (default: False)
+
+    Returns:
+        Dictionary containing receivers, matching routes and inhibit rules
+    """
+    return await mcp_tools.route_alert(get_client(), fingerprint=fingerprint, labels=labels)
+
+
+@mcp.tool(description="Classify many alerts by the receivers Alertmanager would notify")
+@profiled("route_alerts", _profile_enabled, _profile_dir)
+async def route_alerts(
+    alerts: list[dict[str, str]] | None = None,
+    fingerprints: list[str] | None = None,
+    active_only: bool = True,
+    filter: str | None = None,
+    profile: bool = False,
+) -> dict[str, Any]:
+    """Evaluate the Alertmanager routing tree locally for many alerts.
+
+    Args:
+        alerts: Label sets to route
+        fingerprints: Fingerprints of existing alerts to route
+        active_only: When routing existing alerts, only route active ones (default: True)
+        filter: When routing existing alerts, optional Alertmanager filter query string
+        profile: Write a profile of this call to the profile directory (default: False)
+
+    Returns:
+        Dictionary containing receivers per alert and alert counts per receiver
+    """
+    return await mcp_tools.route_alerts(
+        get_client(),
+        alerts=alerts,
+        fingerprints=fingerprints,
+        active_only=active_only,
+        filter=filter,
+    )
+
+
 if __name__ == "__main__":
     mcp.run()
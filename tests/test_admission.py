@@ -0,0 +1,121 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from alertmanager_mcp.admission import AdmissionController, AdmissionRejectedError, Priority
+
+
+def test_disabled_controller_admits_without_limits():
+    """
+    Test that a controller without limits admits everything and tracks nothing.
+    """
+    controller = AdmissionController(rate=0, burst=10, max_concurrency=0)
+    assert not controller.enabled
+    with controller.admit(Priority.READ, 0):
+        pass
+    assert controller.stats()["priorities"]["read"]["admitted"] == 0
+
+
+def test_rate_limit_rejects_over_budget():
+    """
+    Test that requests beyond the burst are rejected once the wait budget is spent.
+    """
+    controller = AdmissionController(rate=1, burst=2, max_concurrency=0)
+    for _ in range(2):
+        with controller.admit(Priority.READ, 0):
+            pass
+    with pytest.raises(AdmissionRejectedError), controller.admit(Priority.READ, 0.01):
+        pass
+
+    stats = controller.stats()
+    assert stats["priorities"]["read"]["admitted"] == 2
+    assert stats["priorities"]["read"]["rejected"] == 1
+    assert stats["queue_depth"] == 0
+
+
+def test_rate_limit_waits_for_refill():
+    """
+    Test that a request within its wait budget is admitted once a token refills.
+    """
+    controller = AdmissionController(rate=50, burst=1, max_concurrency=0)
+    with controller.admit(Priority.READ, 0):
+        pass
+    with controller.admit(Priority.READ, 1):
+        pass
+    assert controller.stats()["priorities"]["read"]["max_wait_seconds"] > 0
+
+
+def test_writes_are_admitted_before_queued_reads():
+    """
+    Test that a queued write overtakes reads that queued earlier.
+    """
+    controller = AdmissionController(rate=0, burst=1, max_concurrency=1)
+    order: list[str] = []
+    release = threading.Event()
+
+    def hold_slot():
+        with controller.admit(Priority.READ, 1):
+            release.wait(1)
+
+    def request(name: str, priority: Priority):
+        with controller.admit(priority, 2):
+            order.append(name)
+
+    holder = threading.Thread(target=hold_slot)
+    holder.start()
+    while controller.stats()["in_flight"] == 0:
+        time.sleep(0.001)
+
+    reader = threading.Thread(target=request, args=("read", Priority.READ))
+    reader.start()
+    while controller.stats()["queue_depth"] < 1:
+        time.sleep(0.001)
+    writer = threading.Thread(target=request, args=("write", Priority.WRITE))
+    writer.start()
+    while controller.stats()["queue_depth"] < 2:
+        time.sleep(0.001)
+
+    release.set()
+    for thread in (holder, reader, writer):
+        thread.join()
+
+    assert order == ["write", "read"]
+    assert controller.stats()["max_queue_depth"] == 2
+
+
+@pytest.mark.asyncio
+async def test_async_waiters_are_admitted_by_priority():
+    """
+    Test that async waiters share the priority queue and cancelled waiters leave it.
+    """
+    controller = AdmissionController(rate=0, burst=1, max_concurrency=1)
+    order: list[str] = []
+    release = asyncio.Event()
+
+    async def hold_slot():
+        async with controller.admit_async(Priority.READ, 1):
+            await release.wait()
+
+    async def request(name: str, priority: Priority):
+        async with controller.admit_async(priority, 2):
+            order.append(name)
+
+    holder = asyncio.create_task(hold_slot())
+    await asyncio.sleep(0)
+    cancelled = asyncio.create_task(request("cancelled", Priority.WRITE))
+    reads = [asyncio.create_task(request(f"read{i}", Priority.READ)) for i in range(3)]
+    write = asyncio.create_task(request("write", Priority.WRITE))
+    await asyncio.sleep(0.01)
+    assert controller.stats()["queue_depth"] == 5
+
+    cancelled.cancel()
+    await asyncio.sleep(0.01)
+    assert controller.stats()["queue_depth"] == 4
+
+    release.set()
+    await asyncio.gather(holder, write, *reads)
+
+    assert order == ["write", "read0", "read1", "read2"]
+    assert controller.stats()["in_flight"] == 0
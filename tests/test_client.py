@@ -3,6 +3,7 @@ from unittest.mock import Mock
 import pytest
 from requests import HTTPError
 
+from alertmanager_mcp.admission import AdmissionRejectedError
 from alertmanager_mcp.client import AlertmanagerClient
 from alertmanager_mcp.config import Config
 
@@ -69,3 +70,79 @@ def test_http_error(mocker):
     client = AlertmanagerClient(config)
     with pytest.raises(HTTPError):
         client.get_alerts()
+
+
+def test_rejected_read_falls_back_to_cache(mocker):
+    """
+    Test that a read over the rate limit is served from the last response.
+    """
+    mock_response = Mock()
+    mock_response.json.return_value = [{"labels": {"alertname": "TestAlert"}}]
+    mock_response.raise_for_status.return_value = None
+    request = mocker.patch("requests.Session.request", return_value=mock_response)
+
+    def mock_getenv(key, default=None):
+        env_vars = {
+            "ALERTMANAGER_URL": "http://fake-alertmanager",
+            "ALERTMANAGER_RATE_LIMIT": "0.001",
+            "ALERTMANAGER_RATE_BURST": "1",
+            "ALERTMANAGER_READ_MAX_WAIT": "0",
+        }
+        return env_vars.get(key, default)
+
+    mocker.patch("os.getenv", side_effect=mock_getenv)
+
+    config = Config()
+    client = AlertmanagerClient(config)
+    first = client.get_alerts()
+    second = client.get_alerts()
+
+    assert second == first
+    assert request.call_count == 1
+    assert client.get_admission_stats()["cache_fallbacks"] == 1
+    with pytest.raises(AdmissionRejectedError):
+        client.get_silences()
+
+
+def test_get_routing_tree_recompiles_only_on_config_change(mocker, mock_client):
+    """
+    Test that the routing tree is cached until the configuration hash changes.
+    """
+    mock_client.config.routing_ttl = 0
+    get_status = mocker.patch.object(
+        mock_client,
+        "get_status",
+        side_effect=[
+            {"config": {"original": "route:\n  receiver: a\n"}},
+            {"config": {"original": "route:\n  receiver: a\n"}},
+            {"config": {"original": "route:\n  receiver: b\n"}},
+        ],
+    )
+
+    first = mock_client.get_routing_tree()
+    second = mock_client.get_routing_tree()
+    third = mock_client.get_routing_tree()
+
+    assert get_status.call_count == 3
+    assert second is first
+    assert third is not first
+    assert third.receivers({}) == ["b"]
+
+
+def test_get_all_alerts_requests_every_state(mocker, mock_client):
+    """
+    Test that get_all_alerts does not send active=false, which drops firing alerts.
+    """
+    mock_response = Mock()
+    mock_response.json.return_value = []
+    mock_response.raise_for_status.return_value = None
+    request = mocker.patch("requests.Session.request", return_value=mock_response)
+
+    mock_client.get_all_alerts()
+
+    assert request.call_args.kwargs["params"] == {
+        "active": "true",
+        "silenced": "true",
+        "inhibited": "true",
+        "unprocessed": "true",
+    }
@@ -1,14 +1,33 @@
+import asyncio
+import time
 from datetime import timedelta
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 
+from alertmanager_mcp.admission import Priority
+from alertmanager_mcp.client import AlertmanagerClient, track_stale_reads
+from alertmanager_mcp.config import Config
 from alertmanager_mcp.mcp_tools import (
     _parse_duration,
+    batch_query,
     get_alert_details,
     get_alerts,
+    route_alert,
+    route_alerts,
+    search_alerts,
     silence_alert,
 )
+from alertmanager_mcp.routing import RoutingTree
+from alertmanager_mcp.search import AlertIndex
+
+
+def _tool_client() -> Mock:
+    """Create a mock client whose admitted calls run inline."""
+    client = Mock()
+    client.config.search_ttl = 15
+    client.run = AsyncMock(side_effect=lambda priority, fn, *args, **kwargs: fn(*args, **kwargs))
+    return client
 
 
 @pytest.mark.parametrize(
@@ -39,7 +58,7 @@ async def test_get_alerts_tool(mocker):
     """
     Test the get_alerts tool returns summary format.
     """
-    mock_client = Mock()
+    mock_client = _tool_client()
     mock_client.get_alerts.return_value = [
         {
             "fingerprint": "abc123",
@@ -71,7 +90,7 @@ async def test_get_alert_details(mocker):
     """
     Test the get_alert_details tool returns complete alert.
     """
-    mock_client = Mock()
+    mock_client = _tool_client()
     full_alert = {
         "fingerprint": "abc123",
         "labels": {
@@ -88,7 +107,7 @@ async def test_get_alert_details(mocker):
             "runbook_url": "https://example.com/runbook",
         },
     }
-    mock_client.get_alerts.return_value = [full_alert]
+    mock_client.get_all_alerts.return_value = [full_alert]
     result = await get_alert_details(mock_client, fingerprint="abc123")
 
     assert result["alert"] == full_alert
@@ -100,8 +119,8 @@ async def test_get_alert_details_not_found(mocker):
     """
     Test get_alert_details when alert is not found.
     """
-    mock_client = Mock()
-    mock_client.get_alerts.return_value = []
+    mock_client = _tool_client()
+    mock_client.get_all_alerts.return_value = []
     with pytest.raises(ValueError, match="not found"):
         await get_alert_details(mock_client, "nonexistent")
 
@@ -111,7 +130,373 @@ async def test_silence_alert_tool_not_found():
     """
     Test silence_alert when alert is not found.
     """
-    mock_client = Mock()
-    mock_client.get_alerts.return_value = []
+    mock_client = _tool_client()
+    mock_client.get_all_alerts.return_value = []
     with pytest.raises(ValueError, match="not found"):
         await silence_alert(mock_client, "123", "1h", "comment")
+
+
+@pytest.mark.asyncio
+async def test_route_alert_by_fingerprint():
+    """
+    Test route_alert looks up the alert labels and evaluates the routing tree.
+    """
+    mock_client = _tool_client()
+    mock_client.get_routing_tree.return_value = RoutingTree.from_yaml(
+        "route:\n  receiver: default\n  routes:\n    - matchers: ['team=\"db\"']\n"
+        "      receiver: db\n"
+    )
+    mock_client.get_all_alerts.return_value = [
+        {"fingerprint": "abc123", "labels": {"alertname": "DiskFull", "team": "db"}}
+    ]
+
+    result = await route_alert(mock_client, fingerprint="abc123")
+
+    assert result["receivers"] == ["db"]
+    assert result["labels"] == {"alertname": "DiskFull", "team": "db"}
+    assert result["inhibited"] is False
+
+
+@pytest.mark.asyncio
+async def test_route_alert_requires_one_argument():
+    """
+    Test route_alert rejects calls without or with both fingerprint and labels.
+    """
+    with pytest.raises(ValueError, match="Exactly one"):
+        await route_alert(Mock())
+    with pytest.raises(ValueError, match="Exactly one"):
+        await route_alert(Mock(), fingerprint="abc", labels={})
+
+
+@pytest.mark.asyncio
+async def test_route_alerts_counts_by_receiver():
+    """
+    Test route_alerts classifies label sets and counts alerts per receiver.
+    """
+    mock_client = _tool_client()
+    mock_client.get_routing_tree.return_value = RoutingTree.from_yaml(
+        "route:\n  receiver: default\n  routes:\n    - matchers: ['team=\"db\"']\n"
+        "      receiver: db\n"
+    )
+
+    result = await route_alerts(
+        mock_client, alerts=[{"team": "db"}, {"team": "db"}, {"team": "web"}]
+    )
+
+    assert result["count"] == 3
+    assert result["by_receiver"] == {"db": 2, "default": 1}
+    mock_client.get_alerts.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_search_alerts_tool():
+    """
+    Test search_alerts refreshes the index and returns ranked summaries.
+    """
+    mock_client = _tool_client()
+    mock_client.get_all_alerts.return_value = [
+        {
+            "fingerprint": "abc123",
+            "labels": {"alertname": "DiskFull", "instance": "node-7"},
+            "status": {"state": "active"},
+            "annotations": {"summary": "Disk full on node-7"},
+        },
+        {
+            "fingerprint": "def456",
+            "labels": {"alertname": "HighCPU", "instance": "node-8"},
+            "status": {"state": "active"},
+            "annotations": {"summary": "CPU high"},
+        },
+    ]
+
+    result = await search_alerts(mock_client, AlertIndex(), query="disk full")
+
+    mock_client.get_all_alerts.assert_called_once_with()
+    mock_client.get_alerts.assert_not_called()
+
+    assert result["count"] == 1
+    assert result["total"] == 1
+    assert result["alerts"][0]["fingerprint"] == "abc123"
+    assert result["alerts"][0]["summary"] == "Disk full on node-7"
+    assert result["alerts"][0]["score"] > 0
+
+
+@pytest.mark.asyncio
+async def test_search_alerts_refreshes_index_once_per_ttl():
+    """
+    Test concurrent and repeated searches within the TTL fetch the alerts once.
+    """
+    mock_client = _tool_client()
+    mock_client.get_all_alerts.return_value = [
+        {"fingerprint": "abc123", "labels": {"alertname": "DiskFull"}, "annotations": {}}
+    ]
+    index = AlertIndex()
+
+    results = await asyncio.gather(
+        *(search_alerts(mock_client, index, query="diskfull", active_only=False) for _ in range(5))
+    )
+    await search_alerts(mock_client, index, query="diskfull", active_only=False)
+
+    mock_client.get_all_alerts.assert_called_once_with()
+    assert all(r["count"] == 1 for r in results)
+    assert results[0]["indexed_at"] == index.fetched_at.isoformat()
+
+    mock_client.config.search_ttl = 0
+    await search_alerts(mock_client, index, query="diskfull")
+    assert mock_client.get_all_alerts.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_query_uses_one_snapshot():
+    """
+    Test batch_query fetches once and evaluates all sub-queries against the snapshot.
+    """
+    mock_client = _tool_client()
+    mock_client.get_all_alerts.return_value = [
+        {
+            "fingerprint": "abc123",
+            "labels": {"alertname": "DiskFull", "severity": "critical"},
+            "status": {"state": "active"},
+            "annotations": {"summary": "Disk full on node-7"},
+        },
+        {
+            "fingerprint": "def456",
+            "labels": {"alertname": "HighCPU", "severity": "warning"},
+            "status": {"state": "suppressed"},
+            "annotations": {"summary": "CPU high"},
+        },
+    ]
+    mock_client.get_silences.return_value = [{"id": "s1", "comment": "Maintenance"}]
+
+    result = await batch_query(
+        mock_client,
+        queries=[
+            {"tool": "get_alerts", "args": {"filter": 'severity=~"critical|warning"'}},
+            {"tool": "get_alerts", "args": {"active_only": False, "filter": "{severity=warning}"}},
+            {"tool": "get_alert_details", "args": {"fingerprint": "def456"}},
+            {"tool": "list_silences", "args": None},
+            {"tool": "search_alerts", "args": {"query": "disk"}},
+            {"tool": "get_alert_details", "args": {"fingerprint": "missing"}},
+            {"tool": "silence_alert", "args": {}},
+            {"tool": "get_alert_details", "args": {"fp": "abc123"}},
+        ],
+    )
+
+    mock_client.get_all_alerts.assert_called_once_with()
+    mock_client.get_alerts.assert_not_called()
+    mock_client.get_silences.assert_called_once_with()
+    mock_client.get_routing_tree.assert_not_called()
+    assert "snapshot_at" in result
+    results = result["results"]
+    # As with the get_alerts tool, active_only=True keeps suppressed alerts
+    assert [a["fingerprint"] for a in results[0]["result"]["alerts"]] == ["abc123", "def456"]
+    assert [a["fingerprint"] for a in results[1]["result"]["alerts"]] == ["def456"]
+    assert results[2]["result"]["alert"]["labels"]["alertname"] == "HighCPU"
+    assert results[3]["result"]["silences"][0]["id"] == "s1"
+    assert results[4]["result"]["alerts"][0]["fingerprint"] == "abc123"
+    assert "not found" in results[5]["error"]
+    assert "Unsupported tool" in results[6]["error"]
+    assert "Invalid arguments for get_alert_details" in results[7]["error"]
+
+
+@pytest.mark.asyncio
+async def test_batch_query_route_alert():
+    """
+    Test batch_query fetches the routing tree only when a route_alert query is present.
+    """
+    mock_client = _tool_client()
+    mock_client.get_all_alerts.return_value = [
+        {"fingerprint": "abc123", "labels": {"team": "db"}, "status": {"state": "active"}}
+    ]
+    mock_client.get_routing_tree.return_value = RoutingTree.from_yaml(
+        "route:\n  receiver: default\n  routes:\n    - matchers: ['team=\"db\"']\n"
+        "      receiver: db\n"
+    )
+
+    result = await batch_query(
+        mock_client,
+        queries=[{"tool": "route_alert", "args": {"fingerprint": "abc123"}}],
+    )
+
+    assert result["results"][0]["result"]["receivers"] == ["db"]
+    mock_client.get_silences.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_silence_alert_looks_up_alert_at_write_priority():
+    """
+    Test the label lookup of silence_alert is admitted as a write, not a read.
+    """
+    mock_client = _tool_client()
+    mock_client.get_all_alerts.return_value = [
+        {"fingerprint": "abc123", "labels": {"alertname": "TestAlert"}}
+    ]
+    mock_client.create_silence.return_value = {"silenceID": "s1"}
+
+    result = await silence_alert(mock_client, "abc123", "1h", "comment")
+
+    assert result == {"silence_id": "s1"}
+    assert [c.args[:2] for c in mock_client.run.await_args_list] == [
+        (Priority.WRITE, mock_client.get_all_alerts),
+        (Priority.WRITE, mock_client.create_silence),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_silence_alert_overtakes_reads_saturating_thread_pool(mocker):
+    """
+    Test a silence is not stuck behind more queued reads than there are worker threads.
+    """
+    upstream_latency = 0.02
+    reads = 60
+
+    def request(method, url, **kwargs):
+        time.sleep(upstream_latency)
+        response = Mock()
+        response.raise_for_status.return_value = None
+        response.json.return_value = (
+            {"silenceID": "s1"}
+            if method == "POST"
+            else [{"fingerprint": "abc123", "labels": {"alertname": "TestAlert"}}]
+        )
+        return response
+
+    mocker.patch("requests.Session.request", side_effect=request)
+
+    def mock_getenv(key, default=None):
+        env_vars = {
+            "ALERTMANAGER_URL": "http://fake-alertmanager",
+            "ALERTMANAGER_MAX_CONCURRENCY": "1",
+            "ALERTMANAGER_READ_MAX_WAIT": "30",
+        }
+        return env_vars.get(key, default)
+
+    mocker.patch("os.getenv", side_effect=mock_getenv)
+    client = AlertmanagerClient(Config())
+
+    read_tasks = [asyncio.create_task(get_alerts(client)) for _ in range(reads)]
+    queued_by = time.monotonic() + 1
+    while client.get_admission_stats()["queue_depth"] < reads - 1:
+        if time.monotonic() > queued_by:
+            break
+        await asyncio.sleep(0.001)
+
+    started = time.monotonic()
+    result = await silence_alert(client, "abc123", "1h", "comment")
+    latency = time.monotonic() - started
+    await asyncio.gather(*read_tasks)
+
+    assert result == {"silence_id": "s1"}
+    # Lookup and create each wait for at most one in-flight read
+    assert latency < 8 * upstream_latency
+    stats = client.get_admission_stats()
+    assert stats["max_queue_depth"] >= reads - 1
+    assert stats["priorities"]["write"]["admitted"] == 2
+    assert stats["priorities"]["read"]["max_wait_seconds"] > latency
+
+
+@pytest.mark.asyncio
+async def test_get_alerts_marks_cached_result_stale(mocker):
+    """
+    Test a read answered from the admission fallback cache is marked stale.
+    """
+    mock_response = Mock()
+    mock_response.json.return_value = [{"fingerprint": "abc123", "labels": {}}]
+    mock_response.raise_for_status.return_value = None
+    mocker.patch("requests.Session.request", return_value=mock_response)
+
+    def mock_getenv(key, default=None):
+        env_vars = {
+            "ALERTMANAGER_URL": "http://fake-alertmanager",
+            "ALERTMANAGER_RATE_LIMIT": "0.001",
+            "ALERTMANAGER_RATE_BURST": "1",
+            "ALERTMANAGER_READ_MAX_WAIT": "0",
+        }
+        return env_vars.get(key, default)
+
+    mocker.patch("os.getenv", side_effect=mock_getenv)
+    client = AlertmanagerClient(Config())
+
+    fresh = await get_alerts(client)
+    cached = await get_alerts(client)
+
+    assert "stale" not in fresh
+    assert cached["stale"] is True
+    assert cached["cached_at"]
+    assert cached["alerts"] == fresh["alerts"]
+
+
+@pytest.mark.asyncio
+async def test_batch_query_does_not_swallow_handler_bugs(mocker):
+    """
+    Test that a TypeError raised inside a handler propagates instead of becoming an error entry.
+    """
+    mock_client = _tool_client()
+    mock_client.get_all_alerts.return_value = []
+    mocker.patch.dict(
+        "alertmanager_mcp.mcp_tools.BATCH_QUERIES",
+        {"list_silences": Mock(side_effect=TypeError("bug"))},
+    )
+
+    with pytest.raises(TypeError, match="bug"):
+        await batch_query(mock_client, queries=[{"tool": "list_silences"}])
+
+
+@pytest.mark.asyncio
+async def test_batch_query_reports_mistyped_arguments():
+    """
+    Test that sub-query arguments of the wrong type become error entries.
+    """
+    mock_client = _tool_client()
+    mock_client.get_all_alerts.return_value = [
+        {"fingerprint": "abc123", "labels": {"team": "db"}, "status": {"state": "active"}}
+    ]
+    mock_client.get_routing_tree.return_value = RoutingTree.from_yaml("route:\n  receiver: a\n")
+
+    result = await batch_query(
+        mock_client,
+        queries=[
+            {"tool": "search_alerts", "args": {"query": 5}},
+            {"tool": "search_alerts", "args": {"query": "db", "limit": "x"}},
+            {"tool": "get_alerts", "args": {"filter": 7}},
+            {"tool": "route_alert", "args": {"labels": "abc"}},
+            {"tool": "route_alert", "args": {"labels": {"x": 1}}},
+            {"tool": "list_silences", "args": ["unexpected"]},
+            {"tool": "search_alerts", "args": {"query": "db", "limit": "5"}},
+        ],
+    )
+
+    results = result["results"]
+    assert results[0]["error"] == (
+        "Invalid arguments for search_alerts: query: Input should be a valid string"
+    )
+    assert "limit: Input should be a valid integer" in results[1]["error"]
+    assert "filter: Input should be a valid string" in results[2]["error"]
+    assert "labels: Input should be a valid dictionary" in results[3]["error"]
+    assert "labels.x: Input should be a valid string" in results[4]["error"]
+    assert "args must be an object" in results[5]["error"]
+    # Numeric strings are accepted, as for the tools themselves
+    assert results[6]["result"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_query_snapshot_at_uses_cached_fetch_time():
+    """
+    Test that snapshot_at reports the fetch time of a part served from the read cache.
+    """
+    mock_client = _tool_client()
+    mock_client.get_all_alerts.return_value = []
+    fetched_at = "2025-01-01T00:00:00+00:00"
+
+    def get_silences():
+        with track_stale_reads() as cached_at:
+            cached_at.append(fetched_at)
+        return []
+
+    mock_client.get_silences.side_effect = get_silences
+
+    result = await batch_query(mock_client, queries=[{"tool": "list_silences"}])
+
+    assert result["snapshot_at"] == fetched_at
+    assert result["stale"] is True
+    assert result["cached_at"] == fetched_at
@@ -0,0 +1,122 @@
+import json
+import threading
+import time
+
+import pytest
+
+from alertmanager_mcp.profiling import Profile, phase, profiled
+
+
+def test_phase_is_noop_without_active_profile():
+    """
+    Test that phase() returns the shared no-op context when not profiling.
+    """
+    assert phase("fetch") is phase("decode")
+    with phase("fetch"):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_profiled_disabled_calls_through(tmp_path):
+    """
+    Test that a disabled profiler writes nothing and returns the handler result.
+    """
+
+    @profiled("tool", lambda: False, lambda: str(tmp_path))
+    async def handler(profile: bool = False):
+        with phase("fetch"):
+            pass
+        return {"ok": True}
+
+    assert await handler() == {"ok": True}
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_profiled_per_call_flag_writes_profile(tmp_path):
+    """
+    Test that profile=True records phases and writes collapsed stacks.
+    """
+
+    @profiled("tool", lambda: False, lambda: str(tmp_path))
+    async def handler(profile: bool = False):
+        with phase("fetch"):
+            time.sleep(0.02)
+        with phase("decode"):
+            pass
+        return {"ok": True}
+
+    assert await handler(profile=True) == {"ok": True}
+
+    summary_file = next(tmp_path.glob("*-tool.json"))
+    summary = json.loads(summary_file.read_text())
+    assert set(summary["phases"]) == {"fetch", "decode", "serialize"}
+    assert summary["phases"]["fetch"] >= 0.02
+    assert summary["samples"] > 0
+
+    collapsed = next(tmp_path.glob("*-tool.collapsed")).read_text().splitlines()
+    assert collapsed
+    stack, count = collapsed[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert ";" in stack
+
+
+@pytest.mark.asyncio
+async def test_profiled_env_flag_writes_profile_on_error(tmp_path):
+    """
+    Test that an enabled profiler still writes its files when the handler raises.
+    """
+
+    @profiled("failing", lambda: True, lambda: str(tmp_path))
+    async def handler():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        await handler()
+
+    summary = json.loads(next(tmp_path.glob("*-failing.json")).read_text())
+    assert summary["phases"] == {}
+
+
+def test_profile_phase_accumulates():
+    """
+    Test that repeated phases are summed.
+    """
+    profile = Profile("tool")
+    with profile.phase("fetch"):
+        pass
+    first = profile.phases["fetch"]
+    with profile.phase("fetch"):
+        time.sleep(0.001)
+    assert profile.phases["fetch"] > first
+
+
+def test_profile_phase_sums_concurrent_threads(mocker):
+    """
+    Test that phases recorded by several threads at once lose no updates.
+    """
+    # Per-thread clock advancing by one per reading, so every phase lasts exactly 1
+    clock = threading.local()
+
+    def perf_counter():
+        clock.now = getattr(clock, "now", 0) + 1
+        return clock.now
+
+    profile = Profile("tool")
+    mocker.patch("alertmanager_mcp.profiling.time.perf_counter", side_effect=perf_counter)
+    barrier = threading.Barrier(8)
+
+    def work():
+        barrier.wait()
+        for _ in range(500):
+            with profile.phase("fetch"):
+                pass
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert profile.phases == {"fetch": 8 * 500}
+    assert len(profile.thread_ids) == 9
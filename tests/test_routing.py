@@ -0,0 +1,176 @@
+import pytest
+
+from alertmanager_mcp.routing import RoutingTree, parse_matcher, parse_matchers
+
+CONFIG = """
+route:
+  receiver: default
+  group_by: [alertname]
+  group_wait: 30s
+  routes:
+    - matchers: ['team="db"']
+      receiver: db-slack
+      continue: true
+    - matchers: ['team="db"', 'severity=~"critical|page"']
+      receiver: db-pager
+      group_by: [alertname, instance]
+    - match:
+        team: web
+      receiver: web
+      routes:
+        - match_re:
+            severity: crit.*
+          receiver: web-pager
+          group_by: ['...']
+inhibit_rules:
+  - source_matchers: ['severity="critical"']
+    target_matchers: ['severity="warning"']
+    equal: [alertname]
+"""
+
+
+@pytest.mark.parametrize(
+    "text, labels, expected",
+    [
+        ('severity="critical"', {"severity": "critical"}, True),
+        ("severity!=critical", {"severity": "critical"}, False),
+        ('severity=~"crit.*"', {"severity": "critical"}, True),
+        ('severity=~"crit"', {"severity": "critical"}, False),
+        ('severity!~"warn.*"', {}, True),
+        ('team=""', {}, True),
+        ('x=~"foo"', {"x": "foo\n"}, False),
+        ('msg="a \\"quoted\\", value"', {"msg": 'a "quoted", value'}, True),
+    ],
+)
+def test_parse_matcher(text, labels, expected):
+    """
+    Test matcher parsing and anchored, missing-label-as-empty evaluation.
+    """
+    assert parse_matcher(text).matches(labels) is expected
+
+
+def test_parse_matchers_with_braces_and_commas():
+    """
+    Test that commas inside quoted values do not split matchers.
+    """
+    matchers = parse_matchers('{team="db", msg="a,b"}')
+    assert [(m.name, m.value) for m in matchers] == [("team", "db"), ("msg", "a,b")]
+
+
+def test_parse_matcher_invalid():
+    """
+    Test that invalid matchers raise ValueError.
+    """
+    with pytest.raises(ValueError):
+        parse_matcher("no operator")
+    with pytest.raises(ValueError):
+        parse_matcher('severity=~"("')
+
+
+def test_route_continue_and_group_by():
+    """
+    Test that continue keeps evaluating siblings and group_by is resolved per route.
+    """
+    tree = RoutingTree.from_yaml(CONFIG)
+    labels = {"alertname": "DiskFull", "team": "db", "severity": "critical", "instance": "n7"}
+
+    result = tree.route(labels)
+
+    assert result["receivers"] == ["db-slack", "db-pager"]
+    assert result["routes"][0]["group_labels"] == {"alertname": "DiskFull"}
+    assert result["routes"][0]["group_wait"] == "30s"
+    assert result["routes"][1]["group_labels"] == {"alertname": "DiskFull", "instance": "n7"}
+    assert result["routes"][1]["route"] == '{}/{team="db",severity=~"critical|page"}'
+    assert result["potential_inhibit_rules"] == []
+    assert result["inhibited"] is None
+
+
+def test_route_nested_and_default():
+    """
+    Test nested legacy matchers, group_by '...' and fallback to the root receiver.
+    """
+    tree = RoutingTree.from_yaml(CONFIG)
+
+    nested = tree.route({"team": "web", "severity": "critical"})
+    assert nested["receivers"] == ["web-pager"]
+    assert nested["routes"][0]["group_labels"] == {"team": "web", "severity": "critical"}
+
+    assert tree.receivers({"team": "web", "severity": "warning"}) == ["web"]
+    assert tree.receivers({"team": "db", "severity": "warning"}) == ["db-slack"]
+    assert tree.receivers({"team": "other"}) == ["default"]
+
+
+def test_route_inhibit_rules():
+    """
+    Test that inhibit rules targeting the label set are reported.
+    """
+    tree = RoutingTree.from_yaml(CONFIG)
+    result = tree.route({"severity": "warning"})
+    assert result["inhibited"] is None
+    assert result["potential_inhibit_rules"] == [
+        {
+            "source_matchers": ['severity="critical"'],
+            "target_matchers": ['severity="warning"'],
+            "equal": ["alertname"],
+        }
+    ]
+
+
+def test_route_inhibited_by_firing_source():
+    """
+    Test that inhibition needs a source alert with equal labels, other than the alert itself.
+    """
+    tree = RoutingTree.from_yaml(
+        CONFIG
+        + "  - source_matchers: ['team=\"db\"']\n"
+        + "    target_matchers: ['team=\"db\"']\n"
+        + "    equal: [instance]\n"
+    )
+    warning = {"alertname": "DiskFull", "severity": "warning"}
+    alerts = [
+        {"fingerprint": "crit-other", "labels": {"alertname": "Other", "severity": "critical"}},
+        {"fingerprint": "warn", "labels": warning},
+    ]
+
+    result = tree.route(warning, alerts)
+    assert result["inhibited"] is False
+    assert result["potential_inhibit_rules"][0]["source_alerts"] == []
+
+    alerts.append(
+        {"fingerprint": "crit", "labels": {"alertname": "DiskFull", "severity": "critical"}}
+    )
+    result = tree.route(warning, alerts)
+    assert result["inhibited"] is True
+    assert result["potential_inhibit_rules"][0]["source_alerts"] == ["crit"]
+
+    # Alerts matching both sides of a rule do not inhibit each other
+    db = {"team": "db", "instance": "n7"}
+    result = tree.route(db, [{"fingerprint": "db", "labels": db}])
+    assert result["inhibited"] is False
+
+
+def test_from_yaml_without_route():
+    """
+    Test that a configuration without route is rejected.
+    """
+    with pytest.raises(ValueError, match="no route"):
+        RoutingTree.from_yaml("receivers: []")
+
+
+def test_route_empty_group_by_inherits_parent():
+    """
+    Test that an empty group_by list inherits the parent's group_by.
+    """
+    tree = RoutingTree.from_yaml(
+        "route:\n  receiver: a\n  group_by: [alertname]\n  routes:\n"
+        "    - receiver: b\n      group_by: []\n"
+    )
+    assert tree.route({"alertname": "X"})["routes"][0]["group_by"] == ["alertname"]
+
+
+def test_from_yaml_invalid_yaml():
+    """
+    Test that unparsable YAML is reported as ValueError.
+    """
+    with pytest.raises(ValueError, match="Invalid Alertmanager configuration"):
+        RoutingTree.from_yaml("route: [unclosed")
@@ -0,0 +1,124 @@
+from datetime import UTC, datetime, timedelta
+
+from alertmanager_mcp.search import AlertIndex, tokenize
+
+
+def _alert(fingerprint, summary, updated_at="t0", state="active", **labels):
+    return {
+        "fingerprint": fingerprint,
+        "updatedAt": updated_at,
+        "status": {"state": state},
+        "labels": labels,
+        "annotations": {"summary": summary},
+    }
+
+
+def test_tokenize():
+    """
+    Test that text is split into lower-cased alphanumeric tokens.
+    """
+    assert tokenize("Disk FULL on node-7!") == ["disk", "full", "on", "node", "7"]
+
+
+def test_search_ranks_full_matches_first():
+    """
+    Test that alerts containing more query tokens rank above rarer partial matches.
+    """
+    index = AlertIndex()
+    index.update(
+        [
+            _alert("a", "disk full", instance="node-7"),
+            _alert("b", "disk almost full", instance="node-8"),
+            _alert("c", "memory high", instance="node-7"),
+            _alert("d", "cpu high", instance="node-9"),
+        ]
+    )
+
+    results, total = index.search("disk full on node-7")
+
+    assert [alert["fingerprint"] for _, alert in results] == ["a", "b", "c", "d"]
+    assert total == 4
+    assert results[0][0] > results[1][0] > results[2][0]
+
+
+def test_search_repeated_tokens_score_higher():
+    """
+    Test that a token occurring several times in an alert increases its score.
+    """
+    index = AlertIndex()
+    index.update([_alert("a", "disk"), _alert("b", "disk disk disk"), _alert("c", "other")])
+
+    results, total = index.search("disk", limit=1)
+
+    assert [alert["fingerprint"] for _, alert in results] == ["b"]
+    assert total == 2
+
+
+def test_search_active_only_uses_latest_state():
+    """
+    Test that state changes are picked up even when updatedAt is unchanged.
+    """
+    index = AlertIndex()
+    index.update([_alert("a", "disk full"), _alert("b", "disk full")])
+    index.update([_alert("a", "disk full"), _alert("b", "disk full", state="suppressed")])
+
+    results, total = index.search("disk", active_only=True)
+
+    assert [alert["fingerprint"] for _, alert in results] == ["a"]
+    assert total == 1
+
+
+def test_update_is_incremental():
+    """
+    Test that only changed alerts are re-indexed and missing alerts are removed.
+    """
+    index = AlertIndex()
+    assert index.update([_alert("a", "disk full"), _alert("b", "cpu high")]) == {
+        "indexed": 2,
+        "removed": 0,
+    }
+    assert index.update([_alert("a", "disk full"), _alert("b", "memory high", "t1")]) == {
+        "indexed": 1,
+        "removed": 0,
+    }
+    assert index.search("cpu") == ([], 0)
+    assert index.search("memory")[1] == 1
+
+    assert index.update([_alert("b", "memory high", "t1")]) == {"indexed": 0, "removed": 1}
+    assert index.search("disk") == ([], 0)
+    assert len(index) == 1
+
+
+def test_search_without_known_tokens():
+    """
+    Test that queries without indexed tokens return no results.
+    """
+    index = AlertIndex()
+    index.update([_alert("a", "disk full")])
+    assert index.search("the") == ([], 0)
+    assert index.search("unknown") == ([], 0)
+
+
+def test_update_ignores_updated_at_bumps():
+    """
+    Test that re-sent alerts with a new updatedAt but the same text are not re-indexed.
+    """
+    index = AlertIndex()
+    index.update([_alert("a", "disk full", "t0")])
+    assert index.update([_alert("a", "disk full", "t1")]) == {"indexed": 0, "removed": 0}
+    assert index.update([_alert("a", "disk almost full", "t1")]) == {"indexed": 1, "removed": 0}
+
+
+def test_update_ignores_older_snapshot():
+    """
+    Test that a snapshot fetched before the indexed one does not roll the index back.
+    """
+    index = AlertIndex()
+    now = datetime.now(UTC)
+    index.update([_alert("a", "disk full")], fetched_at=now)
+
+    changes = index.update([_alert("b", "cpu high")], fetched_at=now - timedelta(seconds=5))
+
+    assert changes == {"indexed": 0, "removed": 0}
+    assert index.fetched_at == now
+    assert [alert["fingerprint"] for _, alert in index.search("disk")[0]] == ["a"]